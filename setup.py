@@ -24,9 +24,13 @@ setup(
         "Programming Language :: Python :: 3.11",
     ],
     python_requires=">=3.7",
+    extras_require={
+        "batch": ["numpy"],
+    },
     entry_points={
         "console_scripts": [
             "snake-game=snake_game.main:main",
+            "snake-game-tournament=snake_game.tournament:main",
         ],
     },
     keywords="snake game terminal ascii ansi",
@@ -5,6 +5,12 @@ Snake Game - A classic terminal-based Snake game with ANSI colors.
 __version__ = "1.0.0"
 __author__ = "Snake Game Developer"
 
-from .game import SnakeGame
+__all__ = ["SnakeGame"]
 
-__all__ = ["SnakeGame"]
\ No newline at end of file
+
+def __getattr__(name):
+    # Loaded on first use, so `import snake_game.core` doesn't pull in the game and renderer
+    if name == "SnakeGame":
+        from .game import SnakeGame
+        return SnakeGame
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Many snakes on one board.
+
+    snake-game arena --snakes 500 --width 2000 --height 2000 --food 1000 --ticks 1000
+
+Arena keeps every snake's body in one shared occupancy map (cell -> snake
+index), so a collision check is one lookup no matter how many snakes there
+are or how long they get. Ticks are simultaneous: every snake picks its
+move, then all of them move at once.
+
+    - A head that hits a wall or a body dies (a tail moving away this tick
+      doesn't count, unless its snake is eating and so keeps it)
+    - Heads that meet in one cell, or swap places, all die
+    - Dead snakes are removed and their cells freed at once
+
+A tick costs O(number of snakes), plus the length of any snake that dies.
+Snakes can be driven by any mix of --moves scripts, bots (see greedy_bot)
+and players, which are just callables fed from their own input.
+"""
+
+import argparse
+import json
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+from .core import DIRECTIONS, STEPS, Direction, FreeCells, GameRandom, MOVE_DIRECTIONS, OPPOSITE_DIRECTIONS, TickEvent
+
+# A script of --moves characters, or a callable(arena, index) returning a move (or None)
+Controller = Union[str, Sequence[str], Callable[['Arena', int], Optional[str]]]
+
+
+class ArenaSnake:
+    __slots__ = ('index', 'body', 'direction', 'alive', 'score', 'ticks')
+
+    def __init__(self, index: int, start: Tuple[int, int], direction: Direction):
+        self.index = index
+        self.body: Deque[Tuple[int, int]] = deque([start])  # Head at index 0
+        self.direction = direction
+        self.alive = True
+        self.score = 0
+        self.ticks = 0  # Ticks survived
+
+
+class Arena:
+    def __init__(self, width: int = 80, height: int = 40, snakes: int = 2, food: int = 1,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            width, height: Board size including the walls, as for SnakeGame
+            snakes: Number of snakes, each starting as one cell on a random free cell
+            food: How many food items are kept on the board
+            seed: Seed for start positions and food, like SnakeGame(seed=...)
+        """
+        self.width = width
+        self.height = height
+        self.rng = GameRandom(seed)
+        self.occupied: Dict[Tuple[int, int], int] = {}  # Cell -> index of the snake on it
+        self.free_cells = FreeCells(width, height, self.occupied)
+        self.food: List[Tuple[int, int]] = []
+        self.food_slots: Dict[Tuple[int, int], int] = {}  # Food cell -> position in self.food
+        self.food_target = food
+        self.ticks = 0
+        self.snakes: List[ArenaSnake] = []
+        for index in range(snakes):
+            start = self.free_cells.sample(self.rng)
+            if start is None:
+                raise ValueError("Not enough room on the board for every snake")
+            self.snakes.append(ArenaSnake(index, start, DIRECTIONS[self.rng.randrange(4)]))
+            self.occupied[start] = index
+            self.free_cells.discard(start)
+        self.alive = snakes
+        self.fill_food()
+
+    def fill_food(self):
+        """Top the food back up to food_target, as long as there is room"""
+        while len(self.food) < self.food_target and len(self.free_cells) > len(self.food):
+            cell = self.free_cells.sample(self.rng)
+            if cell not in self.food_slots:
+                self.food_slots[cell] = len(self.food)
+                self.food.append(cell)
+
+    def remove_food(self, cell: Tuple[int, int]):
+        slot = self.food_slots.pop(cell)
+        last = self.food.pop()
+        if last != cell:
+            self.food[slot] = last
+            self.food_slots[last] = slot
+
+    def step(self, moves: Sequence[Optional[str]] = ()) -> List[Optional[TickEvent]]:
+        """Advance every snake by one tick at the same time
+
+        Args:
+            moves: One --moves character (or None) per snake; missing ones keep going
+
+        Returns:
+            list: What happened to each snake, None for snakes that were already dead
+        """
+        width, height = self.width, self.height
+        occupied = self.occupied
+        food_slots = self.food_slots
+        snakes = self.snakes
+        events: List[Optional[TickEvent]] = [None] * len(snakes)
+
+        # Work out where every live snake's head goes
+        movers = []
+        next_heads: Dict[int, Tuple[int, int]] = {}  # Snake index -> its new head
+        eating = set()  # Indices of snakes whose new head is on food
+        heads: Dict[Tuple[int, int], int] = {}  # New head cell -> how many heads go there
+        for snake in snakes:
+            if not snake.alive:
+                continue
+            move = moves[snake.index] if snake.index < len(moves) else None
+            direction = MOVE_DIRECTIONS.get(move) if move else None
+            if direction is not None and direction is not OPPOSITE_DIRECTIONS[snake.direction]:
+                snake.direction = direction
+            dx, dy = snake.direction.value
+            head = snake.body[0]
+            new_head = (head[0] + dx, head[1] + dy)
+            eats = new_head in food_slots
+            movers.append((snake, new_head, eats))
+            next_heads[snake.index] = new_head
+            if eats:
+                eating.add(snake.index)
+            heads[new_head] = heads.get(new_head, 0) + 1
+
+        # Then decide who survives, all against the board as it was
+        dying = []
+        for snake, new_head, eats in movers:
+            x, y = new_head
+            owner = occupied.get(new_head)
+            if x <= 0 or x >= width - 1 or y <= 0 or y >= height - 1 or heads[new_head] > 1:
+                dying.append(snake)
+            elif owner is not None:
+                other = snakes[owner]
+                tail_leaves = other.body[-1] == new_head and owner not in eating
+                # Two heads passing through each other is a head-on collision too
+                swapped = (other is not snake and other.body[0] == new_head
+                           and next_heads[owner] == snake.body[0])
+                if not tail_leaves or swapped:
+                    dying.append(snake)
+
+        for snake in dying:
+            snake.alive = False
+            self.alive -= 1
+            events[snake.index] = TickEvent.DIED
+            for cell in snake.body:
+                if occupied.get(cell) == snake.index:
+                    del occupied[cell]
+                    self.free_cells.add(cell)
+
+        # Move the survivors: tails first, so a head can take a cell a tail just left
+        survivors = [(snake, new_head, eats) for snake, new_head, eats in movers if snake.alive]
+        for snake, _, eats in survivors:
+            if not eats:
+                tail = snake.body.pop()
+                if occupied.get(tail) == snake.index:
+                    del occupied[tail]
+                    self.free_cells.add(tail)
+        for snake, new_head, eats in survivors:
+            snake.body.appendleft(new_head)
+            occupied[new_head] = snake.index
+            self.free_cells.discard(new_head)
+            snake.ticks += 1
+            if eats:
+                snake.score += 10
+                self.remove_food(new_head)
+                events[snake.index] = TickEvent.EAT
+            else:
+                events[snake.index] = TickEvent.MOVE
+        self.fill_food()
+        self.ticks += 1
+        return events
+
+    def moves_for(self, controllers: Sequence[Optional[Controller]]) -> List[Optional[str]]:
+        """Ask every live snake's controller for its move this tick
+
+        Scripts are read at the current tick, so they line up however long
+        the arena has been running; None controllers just keep going.
+        """
+        moves: List[Optional[str]] = [None] * len(self.snakes)
+        for index, controller in enumerate(controllers):
+            if controller is None or not self.snakes[index].alive:
+                continue
+            if callable(controller):
+                moves[index] = controller(self, index)
+            elif self.ticks < len(controller):
+                moves[index] = controller[self.ticks]
+        return moves
+
+    def run(self, controllers: Sequence[Optional[Controller]], ticks: int) -> dict:
+        """Play up to `ticks` ticks (fewer if every snake dies) and return the summary"""
+        for _ in range(ticks):
+            if not self.alive:
+                break
+            self.step(self.moves_for(controllers))
+        return self.get_state()
+
+    def get_state(self) -> dict:
+        lengths = [len(snake.body) for snake in self.snakes if snake.alive]
+        return {
+            "ticks": self.ticks,
+            "snakes": len(self.snakes),
+            "alive": self.alive,
+            "food": len(self.food),
+            "longest": max(lengths, default=0),
+            "scores": [snake.score for snake in self.snakes],
+        }
+
+
+def greedy_bot(arena: Arena, index: int) -> Optional[str]:
+    """Head for one food item (picked by index, so bots spread out) without stepping into anything
+
+    Looks at the four neighbours only, so it costs O(1) however big the arena is.
+    """
+    snake = arena.snakes[index]
+    head_x, head_y = snake.body[0]
+    target = arena.food[index % len(arena.food)] if arena.food else None
+    reverse = OPPOSITE_DIRECTIONS[snake.direction].value
+    occupied = arena.occupied
+    best, best_distance = None, None
+    for (dx, dy), move in STEPS:
+        x, y = head_x + dx, head_y + dy
+        if (dx, dy) == reverse or (x, y) in occupied or not (0 < x < arena.width - 1 and 0 < y < arena.height - 1):
+            continue
+        distance = abs(x - target[0]) + abs(y - target[1]) if target else 0
+        if best_distance is None or distance < best_distance:
+            best, best_distance = move, distance
+    return best
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(prog='snake-game arena', description='Run many bots on one board headlessly')
+    parser.add_argument('--snakes', type=int, default=500, help='Number of snakes (default: 500)')
+    parser.add_argument('--width', type=int, default=2000, help='Arena width (default: 2000)')
+    parser.add_argument('--height', type=int, default=2000, help='Arena height (default: 2000)')
+    parser.add_argument('--food', type=int, default=1000, help='Food items kept on the board (default: 1000)')
+    parser.add_argument('--ticks', type=int, default=1000, help='Ticks to play (default: 1000)')
+    parser.add_argument('--seed', type=int, help='Seed for start positions and food')
+    parser.add_argument('--moves', action='append', default=[], metavar='MOVES',
+                       help='A --moves script for the next snake (repeat for more); the rest are bots')
+
+    args = parser.parse_args(argv)
+    arena = Arena(args.width, args.height, snakes=args.snakes, food=args.food, seed=args.seed)
+    controllers: List[Optional[Controller]] = list(args.moves[:args.snakes])
+    controllers += [greedy_bot] * (args.snakes - len(controllers))
+    start = time.perf_counter()
+    state = arena.run(controllers, args.ticks)
+    elapsed = time.perf_counter() - start
+    state.pop("scores")
+    state["ticks_per_second"] = round(state["ticks"] / elapsed, 1) if elapsed else None
+    print(json.dumps(state, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Autopilot that plays SnakeGame by itself.
+
+Every interior cell gets a slot on a Hamiltonian cycle of the board. The
+snake only ever moves to a cell whose slot lies ahead of its head and
+before its tail, going round the cycle. That keeps the body in cycle order
+from tail to head, so the tail stays reachable by just following the cycle
+and the snake can never trap itself.
+
+While the snake is short, A* looks for a shorter way to the food through
+cells that keep that order (shortcuts across the cycle). Otherwise, or when
+the food is behind the head, the snake follows the cycle. A plan is kept
+until the food moves or the game strays from it, so most ticks cost O(1),
+and each search gives up after a fixed number of cells so no single tick
+takes long (a few ms on a 200x200 board).
+
+A board whose interior width and height are both odd has no Hamiltonian
+cycle, so the autopilot needs at least one of them to be even (true for
+the default 80x40).
+"""
+
+import heapq
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from .core import STEPS, OPPOSITE_DIRECTIONS
+
+
+def cycle_order(width: int, height: int) -> List[Tuple[int, int]]:
+    """A Hamiltonian cycle over a width x height interior (1-based cells)
+
+    Rows are walked back and forth over columns 2..width, and column 1 leads
+    back to the start, which needs an even number of rows (or columns, by
+    walking the board transposed).
+    """
+    if height % 2 == 1:
+        if width % 2 == 1:
+            raise ValueError("The autopilot needs an even board interior width or height")
+        return [(x, y) for y, x in cycle_order(height, width)]
+    if width < 2:
+        raise ValueError("The autopilot needs a board interior at least 2 cells wide")
+    order = [(1, 1)]
+    for y in range(1, height + 1):
+        columns = range(2, width + 1) if y % 2 == 1 else range(width, 1, -1)
+        order.extend((x, y) for x in columns)
+    order.extend((1, y) for y in range(height, 1, -1))
+    return order
+
+
+class Autopilot:
+    def __init__(self, width: int, height: int, shortcuts: bool = True):
+        """Precompute the cycle for a width x height board (including walls)
+
+        Args:
+            width, height: Board size, as passed to SnakeGame
+            shortcuts: Use A* to cut across the cycle while the snake is
+                shorter than half the board
+        """
+        self.width = width
+        self.height = height
+        self.inner_width = width - 2
+        self.size = (width - 2) * (height - 2)
+        self.shortcuts = shortcuts
+        self.return_column = (height - 2) % 2 == 0  # See cycle_order()
+        self.forward = 1  # Which way rows lead: 1 down (or right if transposed), -1 once turned around
+        self.slots = [0] * self.size  # Cell index -> position on the cycle
+        for slot, cell in enumerate(cycle_order(width - 2, height - 2)):
+            self.slots[self.index_of(cell)] = slot
+        self.plan: Deque[Tuple[int, int]] = deque()  # Cells to move through, next first
+        self.plan_food: Optional[Tuple[int, int]] = None
+        self.retry_tick = 0  # No search before this tick after one gives up
+        self.ticks = 0
+        self.max_expansions = 4 * (width + height)
+        self.expected_head: Optional[Tuple[int, int]] = None
+        self.searches = 0
+
+    def index_of(self, cell: Tuple[int, int]) -> int:
+        return (cell[1] - 1) * self.inner_width + cell[0] - 1
+
+    def inside(self, x: int, y: int) -> bool:
+        return 0 < x < self.width - 1 and 0 < y < self.height - 1
+
+    def next_move(self, game) -> str:
+        """The move to play this tick, in --moves format"""
+        self.ticks += 1
+        head = game.body[0]
+        food = game.food
+        if food != self.plan_food:
+            self.plan.clear()
+            self.plan_food = food
+            self.retry_tick = 0
+        elif self.plan and head != self.expected_head:
+            self.plan.clear()
+
+        if len(game.body) == 1:
+            self.face_direction(game)
+        size = self.size
+        head_slot = self.slots[self.index_of(head)]
+        # Slots strictly between head and tail are free; the tail's slot is the limit
+        if len(game.body) == 1:
+            limit = size
+        else:
+            limit = (self.slots[self.index_of(game.body[-1])] - head_slot) % size
+        grows_to = len(game.body) + 1
+
+        if not self.plan and food is not None and self.shortcuts and grows_to * 2 <= self.size:
+            food_ahead = (self.slots[self.index_of(food)] - head_slot) % size
+            # Shortcuts leave empty slots behind the head that only open up
+            # again once the tail has gone past, within about one body length.
+            # Until then the snake must not run out of slots ahead, so keep
+            # more of them free after eating than the snake is long.
+            if 0 < food_ahead < limit - grows_to - 1 and self.ticks >= self.retry_tick:
+                self.plan = self.search(game, head, head_slot, limit)
+                if not self.plan:
+                    # Too far round the cycle to find quickly; try again further on
+                    self.retry_tick = self.ticks + self.width + self.height
+
+        if self.plan:
+            cell = self.plan.popleft()
+        else:
+            cell = self.follow_cycle(game, head, head_slot, limit, grows_to)
+        self.expected_head = cell
+        return self.move_towards(head, cell)
+
+    def face_direction(self, game):
+        """Turn the cycle around if a one-cell snake is heading the wrong way round it
+
+        The snake can't reverse, so otherwise it could never get back onto the cycle.
+        """
+        head = game.body[0]
+        dx, dy = OPPOSITE_DIRECTIONS[game.direction].value
+        if self.inside(head[0] + dx, head[1] + dy):
+            behind = self.slots[self.index_of((head[0] + dx, head[1] + dy))]
+            if (behind - self.slots[self.index_of(head)]) % self.size == 1:
+                last = self.size - 1
+                self.slots = [last - slot for slot in self.slots]
+                self.forward = -self.forward
+
+    def can_eat(self, ahead: int, limit: int, grows_to: int) -> bool:
+        """Whether eating ahead slots on still leaves a free slot before the tail"""
+        return ahead <= limit - 2 or grows_to >= self.size
+
+    def follow_cycle(self, game, head, head_slot: int, limit: int, grows_to: int) -> Tuple[int, int]:
+        """The neighbour in the nearest slot ahead that is safe to move to"""
+        reverse = OPPOSITE_DIRECTIONS[game.direction].value
+        best, best_ahead = None, None
+        for (dx, dy), _ in STEPS:
+            x, y = head[0] + dx, head[1] + dy
+            if not self.inside(x, y) or (dx, dy) == reverse or (x, y) in game.occupied:
+                continue
+            ahead = (self.slots[self.index_of((x, y))] - head_slot) % self.size
+            if not 0 < ahead < limit or ((x, y) == game.food and not self.can_eat(ahead, limit, grows_to)):
+                continue
+            if best_ahead is None or ahead < best_ahead:
+                best, best_ahead = (x, y), ahead
+        if best is None:
+            # Nothing safe left (the game was played off the cycle); carry on and hope
+            dx, dy = game.direction.value
+            best = (head[0] + dx, head[1] + dy)
+        return best
+
+    def search(self, game, head, head_slot: int, limit: int) -> Deque[Tuple[int, int]]:
+        """A* from head to the food, only stepping forward on the cycle and short of the tail"""
+        self.searches += 1
+        food_x, food_y = game.food
+        size = self.size
+        slots = self.slots
+        inner_width = self.inner_width
+        reverse = OPPOSITE_DIRECTIONS[game.direction].value
+        # Rows only lead one way (down the board, or up once the cycle is
+        # turned around), so food on the other side of a row can only be
+        # reached by going round the cycle's return line (column 1, or row 1
+        # on a transposed cycle)
+        forward = self.forward
+
+        def estimate(x: int, y: int) -> int:
+            if self.return_column:
+                if x > 1 and (food_y - y) * forward < 0:
+                    return x - 1 + food_x - 1 + abs(y - food_y)
+            elif y > 1 and (food_x - x) * forward < 0:
+                return y - 1 + food_y - 1 + abs(x - food_x)
+            return abs(x - food_x) + abs(y - food_y)
+
+        came_from = {head: None}
+        best_steps = {head: 0}
+        # Ties go to the deepest cell, which saves expanding every equally good cell on open ground
+        open_cells = [(estimate(head[0], head[1]), 0, 0, head)]
+        expansions = 0
+        while open_cells and expansions < self.max_expansions:
+            _, depth, ahead, cell = heapq.heappop(open_cells)
+            steps = -depth
+            expansions += 1
+            if steps > best_steps[cell]:
+                continue
+            if cell == game.food:
+                path = deque()
+                while cell != head:
+                    path.appendleft(cell)
+                    cell = came_from[cell]
+                return path
+            for (dx, dy), _ in STEPS:
+                x, y = cell[0] + dx, cell[1] + dy
+                if not (0 < x < self.width - 1 and 0 < y < self.height - 1):
+                    continue
+                if best_steps.get((x, y), steps + 2) <= steps + 1:
+                    continue
+                if steps == 0 and (dx, dy) == reverse:
+                    continue
+                next_ahead = (slots[(y - 1) * inner_width + x - 1] - head_slot) % size
+                if ahead < next_ahead < limit:
+                    came_from[(x, y)] = cell
+                    best_steps[(x, y)] = steps + 1
+                    heapq.heappush(open_cells, (steps + 1 + estimate(x, y), -steps - 1, next_ahead, (x, y)))
+        return deque()
+
+    def move_towards(self, head: Tuple[int, int], cell: Tuple[int, int]) -> str:
+        for (dx, dy), move in STEPS:
+            if (head[0] + dx, head[1] + dy) == cell:
+                return move
+        return '.'
@@ -0,0 +1,254 @@
+"""
+Vectorized engine that steps many Snake games in lockstep with NumPy.
+
+Every game lives in a row of preallocated arrays (head position, ring-buffer
+body, occupancy grid, free-cell index), and BatchEngine.step() advances all of
+them with one set of array operations. The rules, and the random numbers used
+for food placement, are the same as SnakeGame.move_snake/FreeCells, so a game
+seeded with ``seed`` here plays out exactly like ``SnakeGame(seed=seed)``.
+
+Requires numpy (``pip install terminal-snake-game[batch]``).
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .core import DIRECTION_CODES, DIRECTIONS, Direction, GameRandom, GameState, MOVE_DIRECTIONS
+
+# Action codes index into DIRECTIONS; NO_ACTION keeps the current direction
+NO_ACTION = -1
+
+DX = np.array([direction.value[0] for direction in DIRECTIONS], dtype=np.int32)
+DY = np.array([direction.value[1] for direction in DIRECTIONS], dtype=np.int32)
+OPPOSITE = np.array([DIRECTION_CODES[d] for d in (Direction.DOWN, Direction.UP, Direction.RIGHT, Direction.LEFT)],
+                    dtype=np.int8)
+
+# Per-game results of a step(); same meaning as TickEvent
+EVENT_NONE = 0  # Game had already ended before this step
+EVENT_MOVE = 1
+EVENT_EAT = 2
+EVENT_DIED = 3
+EVENT_WON = 4
+
+
+def encode_actions(actions) -> np.ndarray:
+    """Turn Directions, --moves characters or None into int8 action codes"""
+    if isinstance(actions, np.ndarray) and actions.dtype.kind in 'iu':
+        return actions.astype(np.int8, copy=False)
+    codes = []
+    for action in actions:
+        if isinstance(action, Direction):
+            codes.append(DIRECTION_CODES[action])
+        elif isinstance(action, str):
+            direction = MOVE_DIRECTIONS.get(action)
+            codes.append(NO_ACTION if direction is None else DIRECTION_CODES[direction])
+        elif action is None:
+            codes.append(NO_ACTION)
+        else:
+            codes.append(int(action))
+    return np.array(codes, dtype=np.int8)
+
+
+class BatchEngine:
+    def __init__(self, seeds: Sequence[int], width: int = 80, height: int = 40):
+        self.width = width
+        self.height = height
+        self.count = len(seeds)
+        self.inner_width = width - 2
+        self.size = (width - 2) * (height - 2)
+        # One spare ring slot so the head never overwrites the tail
+        self.capacity = self.size + 1
+        self.rngs: List[Optional[GameRandom]] = [None] * self.count  # Set by reset_games()
+
+        n = self.count
+        self.direction = np.zeros(n, dtype=np.int8)
+        self.head_x = np.zeros(n, dtype=np.int32)
+        self.head_y = np.zeros(n, dtype=np.int32)
+        self.body = np.zeros((n, self.capacity), dtype=np.int32)  # Ring buffer of cells (y * width + x)
+        self.head_slot = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.occupied = np.zeros((n, width * height), dtype=bool)
+        self.food = np.full(n, -1, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.game_speed_ms = np.zeros(n, dtype=np.int64)
+        self.alive = np.zeros(n, dtype=bool)
+        self.won = np.zeros(n, dtype=bool)
+
+        # Free-cell index (see FreeCells), allocated the first time any game
+        # passes half full
+        self.indexed = np.zeros(n, dtype=bool)
+        self.free_cells: Optional[np.ndarray] = None
+        self.free_positions: Optional[np.ndarray] = None
+
+        self.reset_games(range(n), seeds)
+
+    def reset_games(self, games: Sequence[int], seeds: Sequence[Optional[int]]):
+        """Start the given games over, each like a new SnakeGame(seed=seed)
+
+        Arrays are updated in place, so views into them stay valid.
+        """
+        games = np.asarray(games, dtype=np.int64)
+        if len(games) == 0:
+            return
+        start = (self.height // 2) * self.width + self.width // 2
+        self.direction[games] = DIRECTION_CODES[Direction.RIGHT]
+        self.head_x[games] = self.width // 2
+        self.head_y[games] = self.height // 2
+        self.body[games, 0] = start
+        self.head_slot[games] = 0
+        self.length[games] = 1
+        self.occupied[games] = False
+        self.occupied[games, start] = True
+        self.score[games] = 0
+        self.game_speed_ms[games] = 150
+        self.alive[games] = True
+        self.won[games] = False
+        self.indexed[games] = False
+        for game, seed in zip(games.tolist(), seeds):
+            self.rngs[game] = GameRandom(seed)
+            self.place_food(game)
+
+    def interior_index(self, cells: np.ndarray) -> np.ndarray:
+        return (cells // self.width - 1) * self.inner_width + (cells % self.width - 1)
+
+    def interior_cell(self, index: int) -> int:
+        return (index // self.inner_width + 1) * self.width + index % self.inner_width + 1
+
+    def build_index(self, game: int):
+        if self.free_cells is None:
+            self.free_cells = np.zeros((self.count, self.size), dtype=np.int32)
+            self.free_positions = np.full((self.count, self.size), -1, dtype=np.int32)
+        grid = self.occupied[game].reshape(self.height, self.width)[1:-1, 1:-1]
+        free = np.flatnonzero(~grid.ravel())
+        self.free_cells[game, :len(free)] = free
+        self.free_positions[game, :] = -1
+        self.free_positions[game, free] = np.arange(len(free), dtype=np.int32)
+        self.indexed[game] = True
+
+    def place_food(self, game: int) -> bool:
+        """Same draws as FreeCells.sample, for a single game"""
+        free = self.size - int(self.length[game])
+        if free <= 0:
+            self.food[game] = -1
+            self.won[game] = True
+            return False
+        rng = self.rngs[game]
+        if not self.indexed[game]:
+            if free * 2 > self.size:
+                occupied = self.occupied[game]
+                while True:
+                    cell = self.interior_cell(rng.randrange(self.size))
+                    if not occupied[cell]:
+                        self.food[game] = cell
+                        return True
+            self.build_index(game)
+        self.food[game] = self.interior_cell(int(self.free_cells[game, rng.randrange(free)]))
+        return True
+
+    def step(self, actions) -> np.ndarray:
+        """Apply one action per game and advance every running game by one tick
+
+        Args:
+            actions: One action per game: a direction code (index into
+                DIRECTIONS), NO_ACTION, a Direction, a --moves character or None
+
+        Returns:
+            np.ndarray: EVENT_* code per game
+        """
+        actions = encode_actions(actions)
+        events = np.zeros(self.count, dtype=np.int8)
+        games = np.flatnonzero(self.alive & ~self.won)
+        if len(games) == 0:
+            return events
+
+        # Turn, ignoring 180 degree reversals (change_direction)
+        action = actions[games]
+        turn = (action >= 0) & (action != OPPOSITE[self.direction[games]])
+        self.direction[games[turn]] = action[turn]
+
+        direction = self.direction[games]
+        new_x = self.head_x[games] + DX[direction]
+        new_y = self.head_y[games] + DY[direction]
+        wall = (new_x <= 0) | (new_x >= self.width - 1) | (new_y <= 0) | (new_y >= self.height - 1)
+        cells = np.where(wall, 0, new_y * self.width + new_x)
+        # The current tail still counts as occupied, like move_snake
+        dead = wall | self.occupied[games, cells]
+        self.alive[games[dead]] = False
+        events[games[dead]] = EVENT_DIED
+
+        moved = ~dead
+        games, cells = games[moved], cells[moved]
+        self.head_x[games] = new_x[moved]
+        self.head_y[games] = new_y[moved]
+        self.head_slot[games] = (self.head_slot[games] + 1) % self.capacity
+        self.body[games, self.head_slot[games]] = cells
+        self.occupied[games, cells] = True
+        events[games] = EVENT_MOVE
+
+        # Take the new head out of the free-cell index (swap-remove)
+        indexed = self.indexed[games]
+        if indexed.any():
+            rows = games[indexed]
+            index = self.interior_index(cells[indexed])
+            slot = self.free_positions[rows, index]
+            last_slot = self.size - self.length[rows] - 1
+            last = self.free_cells[rows, last_slot]
+            self.free_cells[rows, slot] = last
+            self.free_positions[rows, last] = slot
+            self.free_positions[rows, index] = -1
+
+        eat = cells == self.food[games]
+
+        # Drop the tail of every snake that didn't eat, and give its cell back
+        grow = games[eat]
+        keep = games[~eat]
+        tail_slot = (self.head_slot[keep] - self.length[keep]) % self.capacity
+        tail = self.body[keep, tail_slot]
+        self.occupied[keep, tail] = False
+        indexed = self.indexed[keep]
+        if indexed.any():
+            rows = keep[indexed]
+            index = self.interior_index(tail[indexed])
+            slot = self.size - self.length[rows] - 1
+            self.free_cells[rows, slot] = index
+            self.free_positions[rows, index] = slot
+
+        if len(grow):
+            self.length[grow] += 1
+            self.score[grow] += 10
+            events[grow] = EVENT_EAT
+            for game in grow.tolist():
+                if not self.place_food(game):
+                    events[game] = EVENT_WON
+            faster = grow[self.game_speed_ms[grow] > 50]
+            self.game_speed_ms[faster] -= 5
+
+        return events
+
+    def running(self) -> np.ndarray:
+        return self.alive & ~self.won
+
+    def snake(self, game: int) -> List[Tuple[int, int]]:
+        """Body cells of one game, head first"""
+        slots = (self.head_slot[game] - np.arange(self.length[game])) % self.capacity
+        return [(int(cell) % self.width, int(cell) // self.width) for cell in self.body[game, slots]]
+
+    def get_state(self, game: int) -> dict:
+        """Game state in the same shape as the matching SnakeGame.get_debug_state() keys"""
+        if not self.alive[game]:
+            state = GameState.GAME_OVER
+        elif self.won[game]:
+            state = GameState.WON
+        else:
+            state = GameState.PLAYING
+        food = int(self.food[game])
+        return {
+            "state": state.value,
+            "snake_head": (int(self.head_x[game]), int(self.head_y[game])),
+            "snake_length": int(self.length[game]),
+            "direction": DIRECTIONS[self.direction[game]].name,
+            "food_position": (food % self.width, food // self.width) if food >= 0 else None,
+            "score": int(self.score[game]),
+            "game_speed_ms": int(self.game_speed_ms[game]),
+        }
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the engine, renderer, automated run loop and startup.
+
+    snake-game bench --save baseline.json
+    snake-game bench --compare baseline.json --threshold 10
+
+Every benchmark reports one number, either a rate (higher is better) or a
+time/size (lower is better), and is run a few times keeping the best
+result. --compare exits with status 1 if any result is more than
+--threshold percent worse than the baseline, so it can gate changes.
+Startup also has an absolute budget: bench exits with status 1 when
+startup/import_ms is over --startup-budget-ms, baseline or not.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import subprocess
+import sys
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .autopilot import Autopilot, cycle_order
+from .game import Direction, FreeCells, SnakeGame
+
+# name -> {"value": ..., "unit": ..., "higher_is_better": ...}
+Results = Dict[str, dict]
+
+# Most allowed for `import snake_game.main`; generous, since CI machines vary
+STARTUP_BUDGET_MS = 150
+
+
+def best_time(func: Callable[[], None], repeat: int) -> float:
+    """Fastest of `repeat` runs of func, in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def lay_snake(game: SnakeGame, length: int) -> List[Direction]:
+    """Lay a snake of `length` along a Hamiltonian cycle of the board
+
+    Returns:
+        list: The direction to take from each cycle position, so the snake
+        can go round the cycle forever without dying
+    """
+    cycle = cycle_order(game.width - 2, game.height - 2)
+    body = cycle[length - 1::-1]
+    game.snake = deque(body)
+    game.occupied = set(body)
+    game.free_cells = FreeCells(game.width, game.height, game.occupied)
+    game.food = None
+    steps = []
+    for (x1, y1), (x2, y2) in zip(cycle, cycle[1:] + cycle[:1]):
+        steps.append(Direction((x2 - x1, y2 - y1)))
+    return steps
+
+
+def bench_move_snake(results: Results, lengths: Sequence[int], ticks: int, repeat: int):
+    for length in lengths:
+        game = SnakeGame(width=80, height=40, debug=False, skip_menu=True, seed=0)
+        steps = lay_snake(game, length)
+        position = [length - 1]
+
+        def run():
+            index = position[0]
+            count = len(steps)
+            for _ in range(ticks):
+                game.direction = steps[index]
+                game.move_snake()
+                index = (index + 1) % count
+            position[0] = index
+
+        seconds = best_time(run, repeat)
+        results[f"move_snake/length={length}"] = {
+            "value": ticks / seconds, "unit": "ticks/s", "higher_is_better": True}
+
+
+def bench_place_food(results: Results, fills: Sequence[float], calls: int, repeat: int):
+    for fill in fills:
+        game = SnakeGame(width=80, height=40, debug=False, skip_menu=True, seed=0)
+        size = (game.width - 2) * (game.height - 2)
+        lay_snake(game, max(1, min(size - 1, int(size * fill))))
+        game.place_food()  # Builds the free-cell index if the board is dense enough
+
+        def run():
+            for _ in range(calls):
+                game.place_food()
+
+        seconds = best_time(run, repeat)
+        results[f"place_food/fill={fill:.2f}"] = {
+            "value": seconds / calls * 1e6, "unit": "us", "higher_is_better": False}
+
+
+def bench_render(results: Results, sizes: Sequence[Tuple[int, int]], frames: int, repeat: int):
+    for width, height in sizes:
+        game = SnakeGame(width=width, height=height, debug=False, skip_menu=True, seed=0)
+        # Always the whole board, so results don't depend on the terminal the bench runs in
+        game.renderer.set_view(width, height)
+        steps = lay_snake(game, min(200, (width - 2) * (height - 2) // 2))
+        game.food = (1, 1) if (1, 1) not in game.occupied else None
+        out = io.StringIO()
+        position = [len(game.snake) - 1]
+
+        def full():
+            game.renderer.invalidate()
+            with contextlib.redirect_stdout(out):
+                game.render_game()
+            out.seek(0)
+            out.truncate()
+
+        def diff():
+            index = position[0]
+            with contextlib.redirect_stdout(out):
+                for _ in range(frames):
+                    game.direction = steps[index]
+                    game.move_snake()
+                    index = (index + 1) % len(steps)
+                    game.render_game()
+            position[0] = index
+            out.seek(0)
+            out.truncate()
+
+        name = f"render/{width}x{height}"
+        results[f"{name}/full_ms"] = {
+            "value": best_time(full, repeat) * 1000, "unit": "ms", "higher_is_better": False}
+        game.renderer.invalidate()
+        full_bytes = len(game.renderer.render(game).encode('utf-8'))
+        results[f"{name}/full_bytes"] = {"value": full_bytes, "unit": "bytes", "higher_is_better": False}
+        results[f"{name}/diff_us"] = {
+            "value": best_time(diff, repeat) / frames * 1e6, "unit": "us", "higher_is_better": False}
+        results[f"{name}/diff_bytes"] = {
+            "value": game.renderer.last_frame_bytes, "unit": "bytes", "higher_is_better": False}
+
+
+def bench_run(results: Results, ticks: int, repeat: int):
+    """Automated run() end to end, without debug output
+
+    The moves follow the autopilot's cycle, so the snake eats and grows
+    but never dies before the moves run out.
+    """
+    game = SnakeGame(width=80, height=40, debug=False, skip_menu=True, seed=0,
+                     autopilot=Autopilot(80, 40, shortcuts=False))
+    moves = []
+    for _ in range(ticks):
+        moves.append(game.get_next_move())
+        game.step(moves[-1])
+
+    def run():
+        game = SnakeGame(width=80, height=40, debug=False, moves=moves, seed=0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.run()
+        assert game.move_index == ticks
+
+    results["run/automated"] = {"value": ticks / best_time(run, repeat), "unit": "ticks/s",
+                                "higher_is_better": True}
+
+
+# Modules a scripted (--moves/--headless) run must not import; they are only for interactive play
+INTERACTIVE_MODULES = ('asyncio', 'termios', 'tty', 'select', 'socket', 'numpy')
+
+
+def import_times(module: str = 'snake_game.main') -> Dict[str, int]:
+    """Import module in a fresh interpreter with -X importtime
+
+    Returns:
+        dict: Cumulative import time in microseconds of every module loaded
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def bench_startup(results: Results, repeat: int):
+    """Cold start of the entry point, as seen by CI scripts starting many short runs"""
+    results["startup/import_ms"] = {
+        "value": min(import_times()['snake_game.main'] for _ in range(repeat)) / 1000,
+        "unit": "ms", "higher_is_better": False}
+    command = [sys.executable, '-m', 'snake_game.main', '--moves', 'rrrr', '--headless']
+
+    def run():
+        subprocess.run(command, capture_output=True, check=True)
+
+    results["startup/scripted_run_ms"] = {
+        "value": best_time(run, repeat) * 1000, "unit": "ms", "higher_is_better": False}
+
+
+def run_benchmarks(quick: bool = False) -> Results:
+    scale = 10 if quick else 1
+    repeat = 2 if quick else 5
+    results: Results = {}
+    bench_move_snake(results, [1, 100, 1000], 50000 // scale, repeat)
+    bench_place_food(results, [0.0, 0.5, 0.9, 0.99], 20000 // scale, repeat)
+    bench_render(results, [(80, 40), (400, 200)], 500 // scale, repeat)
+    bench_run(results, 20000 // scale, repeat)
+    bench_startup(results, repeat)
+    return results
+
+
+def compare(baseline: Results, results: Results, threshold: float) -> List[str]:
+    """Describe every result more than `threshold` percent worse than the baseline"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or not base["value"]:
+            continue
+        change = (result["value"] - base["value"]) / base["value"] * 100
+        worse = -change if result["higher_is_better"] else change
+        if worse > threshold:
+            regressions.append(f"{name}: {base['value']:.4g} -> {result['value']:.4g} {result['unit']}"
+                               f" ({worse:.1f}% worse)")
+    return regressions
+
+
+def over_budget(results: Results, budget_ms: float) -> Optional[str]:
+    """Describe the startup import time if it is over budget_ms"""
+    result = results.get("startup/import_ms")
+    if result is None or result["value"] <= budget_ms:
+        return None
+    return f"startup/import_ms: {result['value']:.4g} ms is over the {budget_ms:g} ms budget"
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(prog='snake-game bench', description='Measure engine and rendering speed')
+    parser.add_argument('--save', metavar='FILE',
+                       help='Write the results as a baseline JSON file')
+    parser.add_argument('--compare', metavar='FILE',
+                       help='Compare against a baseline and exit 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                       help='Percent worse than the baseline that counts as a regression (default: 10)')
+    parser.add_argument('--quick', action='store_true',
+                       help='Fewer iterations, for a fast smoke test')
+    parser.add_argument('--startup-budget-ms', type=float, default=STARTUP_BUDGET_MS, metavar='N',
+                       help=f'Exit 1 if importing the entry point takes over N ms; 0 turns it off '
+                            f'(default: {STARTUP_BUDGET_MS})')
+
+    args = parser.parse_args(argv)
+    results = run_benchmarks(quick=args.quick)
+    for name, result in results.items():
+        print(f"{name:36} {result['value']:>14.4g} {result['unit']}")
+
+    if args.save:
+        with open(args.save, 'w', encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+    failed = False
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            regressions = compare(json.load(handle), results, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold}%:")
+            for regression in regressions:
+                print(f"  {regression}")
+            failed = True
+        else:
+            print(f"\nNo regressions over {args.threshold}%")
+    if args.startup_budget_ms:
+        problem = over_budget(results, args.startup_budget_ms)
+        if problem:
+            print(f"\n{problem}")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Fixed-timestep tick scheduling for the interactive game loop.
+
+Ticks are scheduled on time.monotonic_ns() at fixed intervals from the start
+of the game, so render time, keypresses and wall-clock jumps don't make the
+real tick rate drift from game_speed_ms. How late each tick actually ran is
+kept for p50/p99 jitter stats.
+"""
+
+import time
+from array import array
+from typing import Optional
+
+
+class TickClock:
+    def __init__(self, interval_ms: float, max_catch_up: int = 3, samples: int = 1024):
+        """
+        Args:
+            interval_ms: Time between ticks
+            max_catch_up: Most ticks to run back to back after falling behind;
+                anything further behind is dropped and the schedule restarts
+                from now
+            samples: How many recent tick delays to keep for the jitter stats
+        """
+        self.interval_ns = int(interval_ms * 1_000_000)
+        self.max_catch_up = max_catch_up
+        self.next_tick_ns = time.monotonic_ns() + self.interval_ns
+        self.ticks = 0
+        self.dropped = 0
+        self.delays = array('q', [0]) * samples  # Ring buffer of tick delays in ns
+        self.delay_count = 0
+
+    def set_interval(self, interval_ms: float):
+        """Change the tick interval, starting from the next scheduled tick"""
+        interval_ns = int(interval_ms * 1_000_000)
+        if interval_ns != self.interval_ns:
+            self.next_tick_ns += interval_ns - self.interval_ns
+            self.interval_ns = interval_ns
+
+    def time_until_tick_ms(self) -> float:
+        return (self.next_tick_ns - time.monotonic_ns()) / 1_000_000
+
+    def due_ticks(self) -> int:
+        """Return how many ticks should run now, and move the schedule past them"""
+        now = time.monotonic_ns()
+        late = now - self.next_tick_ns
+        if late < 0:
+            return 0
+        due = late // self.interval_ns + 1
+        self.delays[self.delay_count % len(self.delays)] = late
+        self.delay_count += 1
+        if due > self.max_catch_up:
+            # Too far behind: run what we can and restart the schedule from now
+            self.dropped += due - self.max_catch_up
+            self.next_tick_ns = now + self.interval_ns
+            due = self.max_catch_up
+        else:
+            self.next_tick_ns += due * self.interval_ns
+        self.ticks += due
+        return due
+
+    def percentile_ms(self, percent: float) -> Optional[float]:
+        count = min(self.delay_count, len(self.delays))
+        if count == 0:
+            return None
+        delays = sorted(self.delays[:count])
+        index = min(count - 1, int(count * percent / 100))
+        return delays[index] / 1_000_000
+
+    def get_stats(self) -> dict:
+        return {
+            "interval_ms": self.interval_ns / 1_000_000,
+            "ticks": self.ticks,
+            "dropped": self.dropped,
+            "jitter_p50_ms": self.percentile_ms(50),
+            "jitter_p99_ms": self.percentile_ms(99),
+        }
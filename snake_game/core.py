@@ -0,0 +1,204 @@
+"""
+Game rules shared by every front end: directions, states, tick events, the
+snake body view, the free-cell sampler and the per-game RNG.
+
+This module only needs the standard library's basics, so headless runs,
+bots and the web build can use it without loading the terminal stack
+(asyncio, termios), which game.py only imports once a game goes interactive.
+"""
+
+import os
+import random
+from array import array
+from collections import deque
+from enum import Enum
+from typing import Optional, Set, Tuple
+
+class Direction(Enum):
+    UP = (0, -1)
+    DOWN = (0, 1)
+    LEFT = (-1, 0)
+    RIGHT = (1, 0)
+
+OPPOSITE_DIRECTIONS = {
+    Direction.UP: Direction.DOWN,
+    Direction.DOWN: Direction.UP,
+    Direction.LEFT: Direction.RIGHT,
+    Direction.RIGHT: Direction.LEFT
+}
+
+# Direction codes: replays, snapshots and the batch engine store a direction as its index here
+DIRECTIONS = list(Direction)
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+MOVES = 'udlr'  # The --moves letter for each direction, same order as DIRECTIONS
+# (step delta, --moves letter) for each direction, same order as DIRECTIONS
+STEPS = [(direction.value, move) for direction, move in zip(DIRECTIONS, MOVES)]
+
+# --moves characters ('.' means keep going in the current direction)
+MOVE_DIRECTIONS = {
+    'u': Direction.UP, '8': Direction.UP,
+    'd': Direction.DOWN, '5': Direction.DOWN,
+    'l': Direction.LEFT, '4': Direction.LEFT,
+    'r': Direction.RIGHT, '6': Direction.RIGHT,
+}
+
+class GameState(Enum):
+    MENU = "menu"
+    PLAYING = "playing"
+    GAME_OVER = "game_over"
+    WON = "won"
+
+# Keypress turns held for later ticks; more would make the snake lag the player
+MAX_QUEUED_TURNS = 3
+
+class TickEvent(Enum):
+    MOVE = "move"
+    EAT = "eat"
+    DIED = "died"
+    WON = "won"
+
+class SnakeView:
+    """Read-only view of a snake body deque (head first) that acts like the list it used to be
+
+    Indexing, len(), iteration and `in` go straight to the deque; slices
+    return lists, and a view compares equal to a list of the same cells.
+    """
+    __slots__ = ('body',)
+    __hash__ = None
+
+    def __init__(self, body: deque):
+        self.body = body
+
+    def __len__(self):
+        return len(self.body)
+
+    def __iter__(self):
+        return iter(self.body)
+
+    def __reversed__(self):
+        return reversed(self.body)
+
+    def __contains__(self, cell):
+        return cell in self.body
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self.body)[index]
+        return self.body[index]
+
+    def __eq__(self, other):
+        if isinstance(other, SnakeView):
+            other = other.body
+        if isinstance(other, (list, deque)):
+            return len(self.body) == len(other) and all(a == b for a, b in zip(self.body, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self.body))
+
+class FreeCells:
+    """Free interior cells of the board, with O(1) uniform sampling.
+
+    While at least half of the board is free, sampling simply retries random
+    cells against the occupancy set (two tries on average). Once the snake
+    fills more than half of the board, an indexable set of free cells is built
+    and kept up to date with swap-remove, so sampling stays a single draw no
+    matter how full the board gets. Both paths pick uniformly among free cells.
+    """
+    
+    def __init__(self, width: int, height: int, occupied: Set[Tuple[int, int]]):
+        self.inner_width = width - 2
+        self.size = (width - 2) * (height - 2)
+        self.occupied = occupied
+        self.cells: Optional[array] = None  # Free cell indices, unordered
+        self.positions: Optional[array] = None  # Cell index -> slot in self.cells
+        
+    def __len__(self) -> int:
+        return self.size - len(self.occupied)
+        
+    def index_of(self, cell: Tuple[int, int]) -> int:
+        return (cell[1] - 1) * self.inner_width + (cell[0] - 1)
+        
+    def cell_at(self, index: int) -> Tuple[int, int]:
+        return (index % self.inner_width + 1, index // self.inner_width + 1)
+        
+    def build_index(self):
+        self.cells = array('i')
+        self.positions = array('i', [-1]) * self.size
+        for index in range(self.size):
+            if self.cell_at(index) not in self.occupied:
+                self.positions[index] = len(self.cells)
+                self.cells.append(index)
+                
+    def add(self, cell: Tuple[int, int]):
+        """Mark a cell as free again (call after removing it from occupied)"""
+        if self.cells is not None:
+            index = self.index_of(cell)
+            self.positions[index] = len(self.cells)
+            self.cells.append(index)
+            
+    def discard(self, cell: Tuple[int, int]):
+        """Mark a cell as taken (call after adding it to occupied)"""
+        if self.cells is not None:
+            index = self.index_of(cell)
+            slot = self.positions[index]
+            last = self.cells.pop()
+            if last != index:
+                self.cells[slot] = last
+                self.positions[last] = slot
+            self.positions[index] = -1
+            
+    def sample(self, rng) -> Optional[Tuple[int, int]]:
+        """Return a uniformly random free cell, or None if the board is full"""
+        free = len(self)
+        if free <= 0:
+            return None
+        if self.cells is None:
+            if free * 2 > self.size:
+                while True:
+                    cell = self.cell_at(rng.randrange(self.size))
+                    if cell not in self.occupied:
+                        return cell
+            self.build_index()
+        return self.cell_at(self.cells[rng.randrange(free)])
+
+class GameRandom(random.Random):
+    """Seedable RNG for one game (SplitMix64), with a single-integer state.
+    
+    Each game owns one, so seeded games replay identically no matter what
+    else uses the random module, and the whole RNG state fits in a debug dump
+    or a replay keyframe as one 64-bit number. All random.Random methods work
+    on top of getrandbits()/random().
+    """
+    
+    MASK = (1 << 64) - 1
+    
+    def seed(self, a: Optional[int] = None):
+        if a is None:
+            a = int.from_bytes(os.urandom(8), 'little')
+        self.state = a & self.MASK
+        self.gauss_next = None
+        
+    def next64(self) -> int:
+        self.state = z = (self.state + 0x9E3779B97F4A7C15) & self.MASK
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & self.MASK
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & self.MASK
+        return z ^ (z >> 31)
+        
+    def getrandbits(self, k: int) -> int:
+        if 0 < k <= 64:
+            return self.next64() >> (64 - k)
+        bits = 0
+        for shift in range(0, k, 64):
+            bits |= self.next64() << shift
+        return bits >> (-k % 64) if k else 0
+        
+    def random(self) -> float:
+        return (self.next64() >> 11) * (1.0 / (1 << 53))
+        
+    def getstate(self) -> int:
+        return self.state
+        
+    def setstate(self, state: int):
+        self.state = state & self.MASK
+        self.gauss_next = None
@@ -0,0 +1,60 @@
+"""
+Structured debug output as JSON Lines.
+
+A DebugSink attached to a game writes one compact JSON object per selected
+tick to a file or pipe: every N ticks, and/or on events (eat, turn, died,
+won). The game only calls the sink when one is attached, and the sink only
+builds the debug state for ticks it actually writes, so long runs keep
+debug visibility at little cost.
+"""
+
+import json
+from typing import IO, Iterable, Optional
+
+EVENTS = ('move', 'eat', 'turn', 'died', 'won')
+DEFAULT_EVENTS = ('eat', 'turn', 'died', 'won')
+
+
+class DebugSink:
+    def __init__(self, stream: IO[str], every: int = 0, events: Optional[Iterable[str]] = DEFAULT_EVENTS):
+        """
+        Args:
+            stream: Text file, pipe or socket file to write lines to
+            every: Also write every Nth tick (0: only on events)
+            events: Events that always get a line; 'turn' means the
+                direction changed this tick
+        """
+        self.stream = stream
+        self.every = every
+        self.events = frozenset(events or ())
+        unknown = self.events - set(EVENTS)
+        if unknown:
+            raise ValueError(f"Unknown debug events: {', '.join(sorted(unknown))}")
+        self.ticks = 0
+        self.last_direction = None
+        self.lines = 0
+
+    def attach(self, game):
+        """Start logging game's ticks"""
+        self.last_direction = game.direction
+        game.debug_sink = self
+
+    def tick(self, game, event):
+        """Called by SnakeGame.step() after every tick"""
+        self.ticks += 1
+        kind = event.value
+        turned = game.direction is not self.last_direction
+        self.last_direction = game.direction
+        if turned and kind == 'move':
+            kind = 'turn'
+        if kind in self.events or (self.every and self.ticks % self.every == 0):
+            self.write(game, kind)
+
+    def write(self, game, event: str):
+        record = {"tick": self.ticks, "event": event}
+        record.update(game.get_debug_state())
+        self.stream.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self.lines += 1
+
+    def close(self):
+        self.stream.flush()
@@ -0,0 +1,191 @@
+"""
+Reinforcement-learning environments in the Gymnasium style, on BatchEngine.
+
+    env = VecEnv(64, width=20, height=20)
+    obs, info = env.reset(seed=0)
+    obs, reward, terminated, truncated, info = env.step(actions)
+
+Observations are NumPy arrays allocated once and updated in place:
+
+    obs["grid"]      bool (envs, 3, height, width): body, head and food planes
+    obs["features"]  float32 (envs, len(FEATURES)): see FEATURES
+
+The body plane *is* the engine's occupancy grid (the engine writes straight
+into the observation buffer), and the head and food planes only have the
+cells that changed touched each step, so a step costs no per-game Python
+objects and no full-grid copies. The same arrays come back every step; copy
+them if you need to keep one.
+
+Finished games are started again at once (with the next seed) when
+auto_reset is on, Gymnasium VecEnv style; the reward, terminated and
+final_score of the step they finished on are still reported, and
+info["final_observation"] holds the observation they finished with. Rows of
+final_score and final_observation are only meaningful where terminated or
+truncated is set.
+
+Requires numpy (``pip install terminal-snake-game[batch]``).
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .batch import DX, DY, EVENT_DIED, EVENT_EAT, EVENT_WON, BatchEngine
+from .core import DIRECTIONS
+
+# Scalar features, in obs["features"] column order
+FEATURES = ("direction_x", "direction_y", "food_dx", "food_dy", "length")
+
+REWARD_EAT = 1.0
+REWARD_DIED = -1.0
+
+BODY, HEAD, FOOD = range(3)
+
+
+class VecEnv:
+    def __init__(self, num_envs: int, width: int = 20, height: int = 20,
+                 max_steps: Optional[int] = None, auto_reset: bool = True):
+        """
+        Args:
+            num_envs: Number of games stepped together
+            width, height: Board size including the walls, as for SnakeGame
+            max_steps: Truncate games after this many steps (None: never)
+            auto_reset: Restart finished games inside step()
+        """
+        self.num_envs = num_envs
+        self.width = width
+        self.height = height
+        self.max_steps = max_steps
+        self.auto_reset = auto_reset
+        self.action_count = len(DIRECTIONS)  # Actions index DIRECTIONS; -1 keeps going
+
+        n, cells = num_envs, width * height
+        self.planes = np.zeros((n, 3, cells), dtype=bool)
+        self.grid = self.planes.reshape(n, 3, height, width)
+        self.features = np.zeros((n, len(FEATURES)), dtype=np.float32)
+        self.observation = {"grid": self.grid, "features": self.features}
+        self.reward = np.zeros(n, dtype=np.float32)
+        self.terminated = np.zeros(n, dtype=bool)
+        self.truncated = np.zeros(n, dtype=bool)
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.final_score = np.zeros(n, dtype=np.int64)
+        self.final_observation = {"grid": np.zeros_like(self.grid), "features": np.zeros_like(self.features)}
+        self.info = {"final_score": self.final_score, "final_observation": self.final_observation,
+                     "steps": self.steps}
+        self.head_cell = np.zeros(n, dtype=np.int64)  # Cells currently set in the head/food planes
+        self.food_cell = np.full(n, -1, dtype=np.int64)
+        self.next_seed: Optional[int] = None
+        self.engine: Optional[BatchEngine] = None
+
+    def seeds(self, count: int):
+        if self.next_seed is None:
+            return [None] * count
+        seeds = list(range(self.next_seed, self.next_seed + count))
+        self.next_seed += count
+        return seeds
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[dict, dict]:
+        """Start every game over; game i gets seed + i, and later restarts carry on counting"""
+        self.next_seed = seed
+        seeds = self.seeds(self.num_envs)
+        if self.engine is None:
+            self.engine = BatchEngine(seeds, self.width, self.height)
+            # The engine's occupancy grid becomes the body plane, so it is never copied
+            self.planes[:, BODY] = self.engine.occupied
+            self.engine.occupied = self.planes[:, BODY]
+        else:
+            self.engine.reset_games(range(self.num_envs), seeds)
+        self.planes[:, HEAD:] = False
+        self.food_cell[:] = -1
+        self.steps[:] = 0
+        self.final_score[:] = 0
+        self.final_observation["grid"][:] = False
+        self.final_observation["features"][:] = 0
+        self.update_observation()
+        return self.observation, self.info
+
+    def step(self, actions) -> Tuple[dict, np.ndarray, np.ndarray, np.ndarray, dict]:
+        """Apply one action per game
+
+        Args:
+            actions: Direction codes (indices into DIRECTIONS), -1 for no
+                turn, or anything else BatchEngine.step() accepts
+
+        Returns:
+            tuple: (observation, reward, terminated, truncated, info), all
+            preallocated arrays updated in place
+        """
+        engine = self.engine
+        events = engine.step(actions)
+        self.steps += 1
+        reward = self.reward
+        reward[:] = 0
+        reward[events == EVENT_EAT] = REWARD_EAT
+        reward[events == EVENT_WON] = REWARD_EAT
+        reward[events == EVENT_DIED] = REWARD_DIED
+        np.logical_not(engine.running(), out=self.terminated)
+        if self.max_steps is None:
+            self.truncated[:] = False
+        else:
+            np.greater_equal(self.steps, self.max_steps, out=self.truncated)
+            self.truncated &= ~self.terminated
+        done = np.flatnonzero(self.terminated | self.truncated)
+        self.update_observation()
+        if len(done):
+            self.final_score[done] = engine.score[done]
+            self.final_observation["grid"][done] = self.grid[done]
+            self.final_observation["features"][done] = self.features[done]
+            if self.auto_reset:
+                engine.reset_games(done, self.seeds(len(done)))
+                self.steps[done] = 0
+                self.update_observation()
+        return self.observation, reward, self.terminated, self.truncated, self.info
+
+    def update_observation(self):
+        engine = self.engine
+        rows = np.arange(self.num_envs)
+        head_plane = self.planes[:, HEAD]
+        food_plane = self.planes[:, FOOD]
+
+        head_plane[rows, self.head_cell] = False
+        np.add(engine.head_y * self.width, engine.head_x, out=self.head_cell)
+        head_plane[rows, self.head_cell] = True
+
+        had_food = self.food_cell >= 0
+        food_plane[rows[had_food], self.food_cell[had_food]] = False
+        self.food_cell[:] = engine.food
+        has_food = self.food_cell >= 0
+        food_plane[rows[has_food], self.food_cell[has_food]] = True
+
+        features = self.features
+        direction = engine.direction
+        features[:, 0] = DX[direction]
+        features[:, 1] = DY[direction]
+        food = np.where(has_food, self.food_cell, self.head_cell)
+        features[:, 2] = (food % self.width - engine.head_x) / self.width
+        features[:, 3] = (food // self.width - engine.head_y) / self.height
+        features[:, 4] = engine.length / engine.size
+
+
+class SnakeEnv:
+    """A single game with the VecEnv interface, minus the batch dimension"""
+
+    def __init__(self, width: int = 20, height: int = 20, max_steps: Optional[int] = None):
+        self.vec = VecEnv(1, width, height, max_steps=max_steps, auto_reset=False)
+        self.observation = None
+        self.info = None
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[dict, dict]:
+        self.vec.reset(seed)
+        vec = self.vec
+        self.observation = {"grid": vec.grid[0], "features": vec.features[0]}
+        final = vec.final_observation
+        self.info = {"final_score": vec.final_score[0:1],
+                     "final_observation": {"grid": final["grid"][0], "features": final["features"][0]},
+                     "steps": vec.steps[0:1]}
+        return self.observation, self.info
+
+    def step(self, action: int) -> Tuple[dict, float, bool, bool, dict]:
+        _, reward, terminated, truncated, _ = self.vec.step(np.array([action], dtype=np.int8))
+        return self.observation, float(reward[0]), bool(terminated[0]), bool(truncated[0]), self.info
+
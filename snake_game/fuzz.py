@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Randomized invariant checking for the game engine.
+
+    snake-game fuzz --cases 1000000 --workers 8
+
+Each case is a random board size, seed and --moves string over u/d/l/r/.,
+played headlessly with SnakeGame.step(). After every tick the board is
+checked against the invariants in check_invariants(). A failing case is
+shrunk to the shortest move string (with the fewest turns) that still
+fails, and printed as a command line that reproduces it.
+
+Cases are generated inside the workers from (--seed, case number), so a
+run of millions of cases sends only a few integers to each worker, and any
+case can be regenerated on its own with random_case().
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .core import MOVES, GameState, TickEvent
+from .game import SnakeGame
+
+MIN_SIZE = 4  # Smallest board (walls included) with room to move
+
+# (width, height, seed, moves)
+Case = Tuple[int, int, int, str]
+
+
+def check_invariants(game: SnakeGame) -> Optional[str]:
+    """Return a description of the first broken invariant, or None"""
+    snake = game.snake
+    cells = set(snake)
+    if len(cells) != len(snake):
+        return "snake overlaps itself"
+    if cells != game.occupied:
+        return "occupied set does not match the body"
+    if len(snake) != game.score // 10 + 1:
+        return f"length {len(snake)} does not match score {game.score}"
+    for x, y in snake:
+        if not (0 < x < game.width - 1 and 0 < y < game.height - 1):
+            return f"body cell {(x, y)} is outside the borders"
+    if game.food is not None and game.food in cells:
+        return f"food {game.food} is on the body"
+    if game.food is not None and not (0 < game.food[0] < game.width - 1 and 0 < game.food[1] < game.height - 1):
+        return f"food {game.food} is outside the borders"
+    if len(game.free_cells) != (game.width - 2) * (game.height - 2) - len(snake):
+        return "free cell count does not match the body"
+    if game.food is None and game.state is not GameState.WON:
+        return "no food on a board that is not full"
+    return None
+
+
+def run_case(case: Case) -> Optional[Tuple[int, str]]:
+    """Play one case, checking the invariants after every tick
+
+    Returns:
+        tuple: (tick, problem) for the first broken invariant, or None
+    """
+    width, height, seed, moves = case
+    game = SnakeGame(width=width, height=height, debug=False, skip_menu=True, seed=seed)
+    problem = check_invariants(game)
+    if problem:
+        return 0, problem
+    for tick, move in enumerate(moves, 1):
+        event = game.step(move)
+        problem = check_invariants(game)
+        if problem:
+            return tick, problem
+        if event is TickEvent.DIED or event is TickEvent.WON:
+            break
+    return None
+
+
+def shrink(moves: str, fails: Callable[[str], bool]) -> str:
+    """Shrink a failing move string to a minimal one that still fails
+
+    Drops ever smaller chunks of moves (delta debugging), then turns the
+    remaining moves into '.' where that still fails. The result fails, and
+    removing any single move or replacing one with '.' makes it pass.
+    """
+    chunk = len(moves) // 2
+    while chunk >= 1:
+        start = 0
+        while start < len(moves):
+            candidate = moves[:start] + moves[start + chunk:]
+            if fails(candidate):
+                moves = candidate
+            else:
+                start += chunk
+        chunk //= 2
+    for index, move in enumerate(moves):
+        if move != '.':
+            candidate = moves[:index] + '.' + moves[index + 1:]
+            if fails(candidate):
+                moves = candidate
+    return moves
+
+
+def shrink_case(case: Case) -> Case:
+    width, height, seed, moves = case
+    failure = run_case(case)
+    if failure is None:
+        return case
+    # Nothing after the failing tick matters
+    moves = moves[:failure[0]]
+    moves = shrink(moves, lambda candidate: run_case((width, height, seed, candidate)) is not None)
+    return width, height, seed, moves
+
+
+def random_case(seed: int, number: int, max_size: int = 40, max_moves: int = 400) -> Case:
+    """Case `number` of a run with `seed`; the same pair always gives the same case"""
+    rng = random.Random(seed * 1_000_003 + number)
+    width = rng.randint(MIN_SIZE, max_size)
+    height = rng.randint(MIN_SIZE, max_size)
+    # Mostly '.', so snakes get far enough to grow instead of dying on the first turn
+    moves = ''.join(rng.choice(MOVES + '.') if rng.random() < 0.2 else '.' for _ in range(rng.randint(1, max_moves)))
+    return width, height, rng.randrange(2**32), moves
+
+
+def fuzz_batch(seed: int, max_size: int, max_moves: int, numbers: range) -> Tuple[int, List[dict]]:
+    """Run a batch of cases in one worker
+
+    Returns:
+        tuple: (cases run, one failure record per failing case, shrunk)
+    """
+    failures = []
+    for number in numbers:
+        case = random_case(seed, number, max_size, max_moves)
+        failure = run_case(case)
+        if failure is not None:
+            width, height, case_seed, moves = shrink_case(case)
+            tick, problem = run_case((width, height, case_seed, moves))
+            failures.append({
+                "case": number,
+                "problem": problem,
+                "tick": tick,
+                "width": width,
+                "height": height,
+                "seed": case_seed,
+                "moves": moves,
+                "original_moves": len(case[3]),
+            })
+    return len(numbers), failures
+
+
+def run_fuzz(cases: int, seed: int = 0, max_size: int = 40, max_moves: int = 400,
+             workers: Optional[int] = None, batch_size: int = 2000) -> dict:
+    """Run `cases` random cases over a process pool and collect the failures"""
+    workers = workers or os.cpu_count() or 1
+    batches = [range(start, min(start + batch_size, cases)) for start in range(0, cases, batch_size)]
+    worker = partial(fuzz_batch, seed, max_size, max_moves)
+    start = time.perf_counter()
+    if workers == 1:
+        results = [worker(batch) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(worker, batches))
+    elapsed = time.perf_counter() - start
+    failures = [failure for _, batch_failures in results for failure in batch_failures]
+    return {
+        "cases": sum(count for count, _ in results),
+        "seed": seed,
+        "failures": failures,
+        "cases_per_second": round(cases / elapsed, 1) if elapsed else None,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(prog='snake-game fuzz',
+                                     description='Play random move strings and check engine invariants')
+    parser.add_argument('--cases', type=int, default=100000, help='Number of random cases (default: 100000)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for generating cases (default: 0)')
+    parser.add_argument('--max-size', type=int, default=40,
+                       help=f'Largest board width/height; the smallest is {MIN_SIZE} (default: 40)')
+    parser.add_argument('--max-moves', type=int, default=400, help='Longest move string (default: 400)')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='Worker processes (default: all cores)')
+
+    args = parser.parse_args(argv)
+    report = run_fuzz(args.cases, seed=args.seed, max_size=args.max_size, max_moves=args.max_moves,
+                      workers=args.workers)
+    for failure in report["failures"]:
+        failure["reproduce"] = (f"snake-game --headless --width {failure['width']} --height {failure['height']}"
+                                f" --seed {failure['seed']} --moves '{failure['moves']}'")
+    print(json.dumps(report, indent=2))
+    if report["failures"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
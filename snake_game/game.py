@@ -1,80 +1,90 @@
-import random
-import time
 import sys
 import json
-import termios
-import tty
-import select
 import os
 import shutil
-from typing import List, Tuple, Optional
-from enum import Enum
+from collections import deque
+from typing import Callable, Deque, Iterable, List, Set, Tuple, Optional
 
-class Direction(Enum):
-    UP = (0, -1)
-    DOWN = (0, 1)
-    LEFT = (-1, 0)
-    RIGHT = (1, 0)
-
-class GameState(Enum):
-    MENU = "menu"
-    PLAYING = "playing"
-    GAME_OVER = "game_over"
-
-class Colors:
-    RESET = '\033[0m'
-    RED = '\033[91m'
-    GREEN = '\033[92m'
-    YELLOW = '\033[93m'
-    BLUE = '\033[94m'
-    MAGENTA = '\033[95m'
-    CYAN = '\033[96m'
-    WHITE = '\033[97m'
-    BOLD = '\033[1m'
-    BG_BLACK = '\033[40m'
-    BG_GREEN = '\033[42m'
-    BG_RED = '\033[41m'
+from .clock import TickClock
+# The rules live in core.py; they are re-exported here for existing imports
+from .core import (Direction, FreeCells, GameRandom, GameState, MAX_QUEUED_TURNS, MOVE_DIRECTIONS,
+                   OPPOSITE_DIRECTIONS, SnakeView, TickEvent)
+from .render import Colors, FrameRenderer
 
 class SnakeGame:
-    def __init__(self, width: int = 80, height: int = 40, debug: bool = True, moves: List[str] = None, skip_menu: bool = False):
+    def __init__(self, width: int = 80, height: int = 40, debug: bool = True, moves: List[str] = None,
+                 skip_menu: bool = False, seed: Optional[int] = None, autopilot=None,
+                 profile: bool = False):
         self.width = width
         self.height = height
         self.debug = debug
         self.moves = moves or []
         self.move_index = 0
         self.automated = bool(moves)
+        self.autopilot = autopilot  # Picks every move itself when set (see autopilot.py)
         self.skip_menu = skip_menu
         self.original_terminal_settings = None
+        self.renderer = FrameRenderer(width, height)
+        self.clock: Optional[TickClock] = None  # Interactive mode only
+        # Food placement draws only from this, so a seed makes the game reproducible
+        self.seed = seed
+        self.rng = GameRandom(seed)
+        self.profiler = None
+        self.debug_sink = None  # A DebugSink (see debuglog.py) logging ticks as JSON Lines
+        if profile:
+            # Swaps in timed versions of the loop's methods; without it they run untouched
+            from .profiling import PhaseProfiler
+            PhaseProfiler().attach(self)
         self.reset_game()
         self.state = GameState.PLAYING if (self.automated or self.skip_menu) else GameState.MENU
         
     def reset_game(self):
-        self.snake: List[Tuple[int, int]] = [(self.width // 2, self.height // 2)]
+        # The body is a deque (head at index 0) so growing at the head and
+        # dropping the tail are both O(1); self.snake is a list-like view of
+        # it. self.occupied mirrors the body as a set so collision checks
+        # don't scan the whole snake.
+        start = (self.width // 2, self.height // 2)
+        self.body: Deque[Tuple[int, int]] = deque([start])
+        self.occupied: Set[Tuple[int, int]] = {start}
+        self.free_cells = FreeCells(self.width, self.height, self.occupied)
         self.direction = Direction.RIGHT
+        # Turns pressed ahead of time, applied one per tick (see queue_turn)
+        self.turns: Deque[Direction] = deque()
         self.food: Optional[Tuple[int, int]] = None
         self.score = 0
         self.game_speed_ms = 150  # Milliseconds between moves
         self.place_food()
         
-    def place_food(self):
-        while True:
-            x = random.randint(1, self.width - 2)
-            y = random.randint(1, self.height - 2)
-            if (x, y) not in self.snake:
-                self.food = (x, y)
-                break
+    @property
+    def snake(self) -> SnakeView:
+        """The body, head first, as a list-like view; assigning cells replaces the body"""
+        return SnakeView(self.body)
+    
+    @snake.setter
+    def snake(self, cells: Iterable[Tuple[int, int]]):
+        self.body = deque(cells)
+        
+    def place_food(self) -> bool:
+        """Place food on a random free cell. Returns False if the board is full"""
+        self.food = self.free_cells.sample(self.rng)
+        if self.food is None:
+            self.state = GameState.WON
+            return False
+        return True
                 
     def move_snake(self) -> bool:
-        head_x, head_y = self.snake[0]
+        head_x, head_y = self.body[0]
         dx, dy = self.direction.value
         new_head = (head_x + dx, head_y + dy)
         
         if (new_head[0] <= 0 or new_head[0] >= self.width - 1 or
             new_head[1] <= 0 or new_head[1] >= self.height - 1 or
-            new_head in self.snake):
+            new_head in self.occupied):
             return False
             
-        self.snake.insert(0, new_head)
+        self.body.appendleft(new_head)
+        self.occupied.add(new_head)
+        self.free_cells.discard(new_head)
         
         if new_head == self.food:
             self.score += 10
@@ -82,22 +92,33 @@ class SnakeGame:
             if self.game_speed_ms > 50:
                 self.game_speed_ms -= 5  # Get faster as score increases
         else:
-            self.snake.pop()
+            tail = self.body.pop()
+            self.occupied.discard(tail)
+            self.free_cells.add(tail)
             
         return True
         
     def change_direction(self, new_direction: Direction):
-        opposite_directions = {
-            Direction.UP: Direction.DOWN,
-            Direction.DOWN: Direction.UP,
-            Direction.LEFT: Direction.RIGHT,
-            Direction.RIGHT: Direction.LEFT
-        }
-        
-        if new_direction != opposite_directions.get(self.direction):
+        if new_direction is not OPPOSITE_DIRECTIONS[self.direction]:
             self.direction = new_direction
             
+    def queue_turn(self, new_direction: Direction):
+        """Queue a turn from a keypress for an upcoming tick
+        
+        Each tick applies at most one queued turn, so two quick presses (up
+        then left) both happen instead of the second overwriting the first.
+        Turns are checked against the last queued direction, and presses
+        beyond MAX_QUEUED_TURNS are dropped.
+        """
+        last = self.turns[-1] if self.turns else self.direction
+        if new_direction is last or new_direction is OPPOSITE_DIRECTIONS[last]:
+            return
+        if len(self.turns) < MAX_QUEUED_TURNS:
+            self.turns.append(new_direction)
+            
     def get_next_move(self) -> Optional[str]:
+        if self.autopilot is not None:
+            return self.autopilot.next_move(self)
         if not self.automated or self.move_index >= len(self.moves):
             return None
         
@@ -106,97 +127,125 @@ class SnakeGame:
         return move
         
     def process_automated_move(self, move: str):
-        if move == 'u' or move == '8':
-            self.change_direction(Direction.UP)
-        elif move == 'd' or move == '5':
-            self.change_direction(Direction.DOWN)
-        elif move == 'l' or move == '4':
-            self.change_direction(Direction.LEFT)
-        elif move == 'r' or move == '6':
-            self.change_direction(Direction.RIGHT)
-        elif move == '.':
-            pass
+        direction = MOVE_DIRECTIONS.get(move)
+        if direction is not None:
+            self.change_direction(direction)
         
     def is_moves_exhausted(self) -> bool:
         return self.automated and self.move_index >= len(self.moves)
         
+    def start(self):
+        """Leave the menu and start playing; a finished game stays finished"""
+        if self.state is GameState.MENU:
+            self.state = GameState.PLAYING
+        
+    def step(self, move: Optional[str] = None) -> Optional[TickEvent]:
+        """Advance the game by one tick, with no rendering, sleeping or terminal I/O
+        
+        Args:
+            move: Optional move in --moves format (u/d/l/r, 8/5/4/6 or '.')
+            
+        Returns:
+            TickEvent: What happened during the tick, or None if the game is
+            not being played (still in the menu, or already over), in which
+            case nothing moves, like BatchEngine's EVENT_NONE
+        """
+        if self.state is not GameState.PLAYING:
+            return None
+        if self.turns:
+            self.change_direction(self.turns.popleft())
+        if move:
+            self.process_automated_move(move)
+        score = self.score
+        if not self.move_snake():
+            self.state = GameState.GAME_OVER
+            event = TickEvent.DIED
+        elif self.state == GameState.WON:
+            event = TickEvent.WON
+        else:
+            event = TickEvent.EAT if self.score != score else TickEvent.MOVE
+        if self.debug_sink is not None:
+            self.debug_sink.tick(self, event)
+        return event
+        
+    def simulate(self, moves: Optional[Iterable[str]] = None, record_events: bool = False) -> dict:
+        """Play a move sequence headlessly at full CPU speed
+        
+        Args:
+            moves: Moves to play. Defaults to the game's own --moves list,
+                consumed through move_index the same way run() does.
+            record_events: Also return a (tick, move, event, head) tuple per tick
+            
+        Returns:
+            dict: Final debug state plus the number of ticks played, and the
+            per-tick events if requested
+        """
+        self.start()
+        if moves is None:
+            moves = iter(self.get_next_move, None)
+        events = [] if record_events else None
+        ticks = 0
+        
+        for move in moves:
+            if self.state is not GameState.PLAYING:
+                break
+            ticks += 1
+            event = self.step(move)
+            if record_events:
+                events.append((ticks, move, event, self.body[0]))
+            if event is TickEvent.DIED or event is TickEvent.WON:
+                break
+                
+        result = self.get_debug_state()
+        result["ticks"] = ticks
+        if record_events:
+            result["events"] = events
+        return result
+        
     def get_debug_state(self) -> dict:
         return {
             "state": self.state.value,
-            "snake_head": self.snake[0] if self.snake else None,
-            "snake_length": len(self.snake),
+            "snake_head": self.body[0] if self.body else None,
+            "snake_length": len(self.body),
             "direction": self.direction.name,
             "food_position": self.food,
             "score": self.score,
             "game_speed_ms": self.game_speed_ms,
             "automated": self.automated,
+            "autopilot": self.autopilot is not None,
             "skip_menu": self.skip_menu,
             "move_index": self.move_index,
             "total_moves": len(self.moves) if self.moves else 0,
-            "moves_remaining": len(self.moves) - self.move_index if self.moves else 0
+            "moves_remaining": len(self.moves) - self.move_index if self.moves else 0,
+            "seed": self.seed,
+            "rng_state": self.rng.getstate(),
+            "frame_bytes": self.renderer.last_frame_bytes,
+            "tick_stats": self.clock.get_stats() if self.clock else None,
+            "phase_stats": self.profiler.get_stats() if self.profiler else None
         }
         
     def print_debug_state(self):
+        """Put the debug state under the board; it goes out with the next frame"""
         if self.debug:
-            print(f"\nDEBUG STATE: {json.dumps(self.get_debug_state(), indent=2)}")
+            self.renderer.set_footer(f"\nDEBUG STATE: {json.dumps(self.get_debug_state(), indent=2)}")
     
     def clear_screen(self):
         print('\033[2J\033[H', end='')
     
     def render_game(self):
-        # Move cursor to top-left instead of clearing screen
-        print('\033[H', end='')
-        
-        print(f"{Colors.YELLOW}{Colors.BOLD}🐍 SNAKE GAME 🐍{Colors.RESET}")
-        print(f"Score: {Colors.GREEN}{self.score}{Colors.RESET} | Direction: {Colors.CYAN}{self.direction.name}{Colors.RESET}")
-        print()
-        
-        # Create grid
-        grid = [[' ' for _ in range(self.width)] for _ in range(self.height)]
-        
-        # Draw borders (using double-wide blocks)
-        for x in range(self.width):
-            grid[0][x] = '██'
-            grid[self.height - 1][x] = '██'
-        for y in range(self.height):
-            grid[y][0] = '██'
-            grid[y][self.width - 1] = '██'
-            
-        # Draw snake (using emojis)
-        for i, (x, y) in enumerate(self.snake):
-            if i == 0:
-                grid[y][x] = '🐍'  # Snake head
-            else:
-                grid[y][x] = '🟢'  # Snake body (green circle)
-                
-        # Draw food (using fruit emoji)
-        if self.food:
-            fx, fy = self.food
-            grid[fy][fx] = '🍎'  # Apple for food
-            
-        # Print grid
-        for y in range(self.height):
-            for x in range(self.width):
-                char = grid[y][x]
-                if char == '██':
-                    print(f"{Colors.CYAN}{Colors.BOLD}{char}{Colors.RESET}", end='')
-                elif char == '🐍':
-                    print(char, end='')  # Snake head emoji
-                elif char == '🟢':
-                    print(char, end='')  # Snake body emoji
-                elif char == '🍎':
-                    print(char, end='')  # Food emoji
-                else:
-                    print(char + ' ', end='')  # Add space for single-width chars to match double-width
-            print()
-        
-        print(f"\n{Colors.WHITE}Controls: Arrow keys or WASD to move, +/- to adjust speed, Q to quit{Colors.RESET}")
-        print(f"{Colors.WHITE}Current speed: {self.game_speed_ms}ms per frame{Colors.RESET}")
+        # Boards bigger than the terminal (checked every frame, so resizing works) scroll with the head.
+        # Piped output has no terminal to fit, so it gets the whole board.
+        if sys.stdout.isatty():
+            self.renderer.fit_terminal(shutil.get_terminal_size())
+        # Only the cells that changed since the last frame are sent, in one write
+        sys.stdout.write(self.renderer.render(self))
+        sys.stdout.flush()
     
     def setup_terminal(self):
         """Set terminal to cbreak mode with no echo for the entire game session"""
         if not self.automated:
             try:
+                import termios
                 fd = sys.stdin.fileno()
                 self.original_terminal_settings = termios.tcgetattr(fd)
                 # Use cbreak mode and disable echo
@@ -210,64 +259,119 @@ class SnakeGame:
         """Restore terminal to original settings"""
         if self.original_terminal_settings and not self.automated:
             try:
+                import termios
                 fd = sys.stdin.fileno()
                 termios.tcsetattr(fd, termios.TCSADRAIN, self.original_terminal_settings)
             except Exception as e:
                 print(f"Warning: Could not restore terminal: {e}")
 
-    def getch(self, timeout_ms: int = None):
-        """Get a single character from stdin with optional timeout
+    async def read_keyboard(self, keys: 'asyncio.Queue'):
+        """Feed decoded keys from stdin into keys until cancelled
         Terminal should already be in cbreak mode when this is called.
+        """
+        import asyncio
+        from .keys import KeyDecoder
+        loop = asyncio.get_running_loop()
+        fd = sys.stdin.fileno()
+        decoder = KeyDecoder()
+        
+        def on_readable():
+            # Read everything that is waiting, so bursts of keys are never dropped
+            data = os.read(fd, 1024)
+            if not data:
+                loop.remove_reader(fd)
+                keys.put_nowait(None)
+                return
+            self.decode_keys(decoder, data, keys)
+        
+        loop.add_reader(fd, on_readable)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            loop.remove_reader(fd)
+    
+    def decode_keys(self, decoder: 'KeyDecoder', data: bytes, keys: 'asyncio.Queue'):
+        from .keys import queue_keys
+        queue_keys(decoder, data, keys)
+
+    async def play(self, keys: 'asyncio.Queue', draw: Callable[[], None],
+                   clock: Optional[TickClock] = None) -> Optional[TickEvent]:
+        """Play interactively inside an event loop until the game ends or the player quits
+        
+        Keys are handled as soon as they arrive, while ticks run on the game's
+        own fixed TickClock schedule. Nothing here touches the terminal, so
+        many games can be played concurrently in one event loop.
         
         Args:
-            timeout_ms: Timeout in milliseconds. If None, blocks indefinitely.
+            keys: Keys as decoded by KeyDecoder; None means the input was closed
+            draw: Called once at the start and after every tick to show the game
+            clock: Tick schedule to use (default: a new TickClock at game_speed_ms)
             
         Returns:
-            str: Character pressed, or None if timeout occurred
+            TickEvent: DIED or WON if the game ended, None if the player quit
         """
-        if timeout_ms is not None:
-            # Use select to wait for input with timeout
-            timeout_sec = timeout_ms / 1000.0
-            ready, _, _ = select.select([sys.stdin], [], [], timeout_sec)
-            
-            if not ready:
-                # Timeout occurred, no input available
-                return None
+        import asyncio
+        self.start()
+        if self.state is not GameState.PLAYING:
+            return None
+        self.clock = clock = clock or TickClock(self.game_speed_ms)
+        stop = asyncio.Event()
         
-        # Input is available (or no timeout specified)
-        # Terminal is already in cbreak mode, just read
-        ch = sys.stdin.read(1)
+        async def handle_keys():
+            while True:
+                key = await keys.get()
+                if key is None or not self.handle_input(key):
+                    stop.set()
+                    return
         
-        # Handle arrow keys
-        if ch == '\x1b':
-            # For arrow keys, we need to read the next 2 characters
-            # Try to read them immediately without timeout
-            try:
-                next_ch = sys.stdin.read(1)
-                if next_ch == '[':
-                    # This is likely an arrow key, read the final character
-                    final_ch = sys.stdin.read(1)
-                    ch += next_ch + final_ch
-                else:
-                    ch += next_ch
-            except:
-                # If we can't read more, just return the escape character
-                pass
+        key_task = asyncio.ensure_future(handle_keys())
+        try:
+            draw()
+            while not stop.is_set():
+                clock.set_interval(self.game_speed_ms)
+                delay_ms = clock.time_until_tick_ms()
+                if delay_ms > 0:
+                    try:
+                        await asyncio.wait_for(stop.wait(), delay_ms / 1000)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
                 
-        return ch
+                for _ in range(clock.due_ticks()):
+                    event = self.step(self.get_next_move())
+                    if event is TickEvent.DIED or event is TickEvent.WON:
+                        return event
+                draw()
+            return None
+        finally:
+            key_task.cancel()
+    
+    async def run_interactive(self) -> Optional[TickEvent]:
+        import asyncio
+        keys: asyncio.Queue = asyncio.Queue()
+        keyboard_task = asyncio.ensure_future(self.read_keyboard(keys))
+        try:
+            return await self.play(keys, self.draw_frame)
+        finally:
+            keyboard_task.cancel()
+    
+    def draw_frame(self):
+        if self.debug:
+            self.print_debug_state()
+        self.render_game()
     
     def handle_input(self, key: str) -> bool:
         """Handle keyboard input. Returns False if should quit"""
         if key.lower() == 'q':
             return False
         elif key == '\x1b[A' or key.lower() == 'w':  # Up arrow or W
-            self.change_direction(Direction.UP)
+            self.queue_turn(Direction.UP)
         elif key == '\x1b[B' or key.lower() == 's':  # Down arrow or S
-            self.change_direction(Direction.DOWN)
+            self.queue_turn(Direction.DOWN)
         elif key == '\x1b[D' or key.lower() == 'a':  # Left arrow or A
-            self.change_direction(Direction.LEFT)
+            self.queue_turn(Direction.LEFT)
         elif key == '\x1b[C' or key.lower() == 'd':  # Right arrow or D
-            self.change_direction(Direction.RIGHT)
+            self.queue_turn(Direction.RIGHT)
         elif key == '+' or key == '=':  # + key (main or numpad)
             # Decrease frame time (make faster) by 10ms, minimum 10ms
             self.game_speed_ms = max(10, self.game_speed_ms - 10)
@@ -276,6 +380,17 @@ class SnakeGame:
             self.game_speed_ms = min(1000, self.game_speed_ms + 10)
         return True
             
+    def run_automated(self) -> Optional[TickEvent]:
+        while not self.is_moves_exhausted():
+            # Automated runs only render in debug mode
+            if self.debug:
+                self.draw_frame()
+            
+            event = self.step(self.get_next_move())
+            if event is TickEvent.DIED or event is TickEvent.WON:
+                return event
+        return None
+            
     def run(self):
         # Set up terminal for raw mode
         self.setup_terminal()
@@ -283,52 +398,25 @@ class SnakeGame:
         try:
             if self.automated or self.skip_menu:
                 self.state = GameState.PLAYING
+            
+            if self.automated:
+                event = self.run_automated()
+            else:
+                # Only interactive games need the event loop, so scripted runs never import it
+                import asyncio
+                event = asyncio.run(self.run_interactive())
                 
-            while True:
-                if self.automated and self.is_moves_exhausted():
-                    break
-                    
-                if self.state == GameState.PLAYING:
-                    # Render the game (unless automated and not debug)
-                    if not self.automated or self.debug:
-                        self.render_game()
-                        
-                    if self.debug:
-                        self.print_debug_state()
-                        
-                    # Handle input BEFORE moving the snake
-                    if self.automated:
-                        next_move = self.get_next_move()
-                        if next_move:
-                            self.process_automated_move(next_move)
-                    else:
-                        # Interactive mode - get keyboard input with timeout and maintain constant game rate
-                        try:
-                            frame_start_time = time.time()
-                            key = self.getch(timeout_ms=self.game_speed_ms)
-                            if key and not self.handle_input(key):
-                                break  # User pressed Q to quit
-                            
-                            # Sleep for remaining time to maintain constant game rate
-                            elapsed_time = (time.time() - frame_start_time) * 1000  # Convert to ms
-                            remaining_time = self.game_speed_ms - elapsed_time
-                            if remaining_time > 0:
-                                time.sleep(remaining_time / 1000.0)  # Convert back to seconds
-                        except KeyboardInterrupt:
-                            break
-                    
-                    if not self.move_snake():
-                        self.state = GameState.GAME_OVER
-                        # Show game over screen
-                        self.render_game()
-                        print(f"\n{Colors.RED}{Colors.BOLD}GAME OVER!{Colors.RESET}")
-                        print(f"Final Score: {Colors.YELLOW}{self.score}{Colors.RESET}")
-                        # Exit immediately, leaving the board visible
-                        break
-                        
-                    # For automated mode, still add a small delay
-                    if self.automated and not self.debug:
-                        time.sleep(0.1)
+            if event is TickEvent.DIED:
+                # Show game over screen
+                self.render_game()
+                print(f"\n{Colors.RED}{Colors.BOLD}GAME OVER!{Colors.RESET}")
+                print(f"Final Score: {Colors.YELLOW}{self.score}{Colors.RESET}")
+                # Exit immediately, leaving the board visible
+            elif event is TickEvent.WON:
+                # Snake fills the whole board, nowhere left to put food
+                self.render_game()
+                print(f"\n{Colors.GREEN}{Colors.BOLD}YOU WIN!{Colors.RESET}")
+                print(f"Final Score: {Colors.YELLOW}{self.score}{Colors.RESET}")
                             
         except KeyboardInterrupt:
             pass
@@ -337,4 +425,10 @@ class SnakeGame:
             self.restore_terminal()
             if self.automated:
                 print(f"\nFINAL STATE: {json.dumps(self.get_debug_state(), indent=2)}")
+            elif self.debug and self.clock:
+                print(f"\nTICK STATS: {json.dumps(self.clock.get_stats())}")
+            if self.profiler:
+                print(f"\nPHASE STATS:\n{self.profiler.summary()}")
+            if self.debug_sink:
+                self.debug_sink.close()
             print(f"\n{Colors.YELLOW}Thanks for playing Snake! 🐍{Colors.RESET}")
\ No newline at end of file
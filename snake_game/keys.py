@@ -0,0 +1,83 @@
+"""
+Terminal input decoding.
+
+Terminal reads can return several keys at once, or stop in the middle of an
+arrow key's escape sequence. KeyDecoder turns whatever bytes are available
+into whole keys and holds back an unfinished escape sequence until the rest
+of it arrives (or flush() gives up waiting).
+"""
+
+import asyncio
+import codecs
+from typing import List, Optional, Union
+
+ESCAPE = '\x1b'
+ESCAPE_TIMEOUT = 0.05  # Seconds to wait for the rest of an escape sequence
+
+
+def escape_end(text: str, start: int) -> Optional[int]:
+    """Index just past the escape sequence at text[start], or None if it is incomplete"""
+    if start + 1 >= len(text):
+        return None
+    kind = text[start + 1]
+    if kind == '[':
+        # CSI: parameters then a final byte in @..~
+        for index in range(start + 2, len(text)):
+            if '@' <= text[index] <= '~':
+                return index + 1
+        return None
+    if kind == 'O':
+        # SS3: arrow keys in application cursor mode
+        return start + 3 if start + 2 < len(text) else None
+    # ESC followed by an ordinary key is a lone ESC press
+    return start + 1
+
+
+class KeyDecoder:
+    def __init__(self):
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.pending = ''
+
+    def feed(self, data: Union[bytes, str]) -> List[str]:
+        """Return every complete key in data (plus anything held back from before)"""
+        if isinstance(data, bytes):
+            data = self.decoder.decode(data)
+        text = self.pending + data
+        keys = []
+        index = 0
+        while index < len(text):
+            if text[index] != ESCAPE:
+                keys.append(text[index])
+                index += 1
+                continue
+            end = escape_end(text, index)
+            if end is None:
+                break
+            key = text[index:end]
+            if key.startswith('\x1bO'):
+                key = '\x1b[' + key[2:]
+            keys.append(key)
+            index = end
+        self.pending = text[index:]
+        return keys
+
+    def flush(self) -> List[str]:
+        """Give up on an unfinished escape sequence and return it as typed"""
+        keys = [self.pending] if self.pending else []
+        self.pending = ''
+        return keys
+
+
+def queue_keys(decoder: KeyDecoder, data: bytes, keys: asyncio.Queue):
+    """Queue every complete key in data; an unfinished escape sequence is
+    queued as typed if nothing else arrives within ESCAPE_TIMEOUT"""
+    for key in decoder.feed(data):
+        keys.put_nowait(key)
+    if decoder.pending:
+        asyncio.get_running_loop().call_later(ESCAPE_TIMEOUT, flush_stale, decoder, decoder.pending, keys)
+
+
+def flush_stale(decoder: KeyDecoder, pending: str, keys: asyncio.Queue):
+    if decoder.pending == pending:
+        for key in decoder.flush():
+            keys.put_nowait(key)
@@ -3,9 +3,35 @@
 import sys
 import os
 import argparse
+import json
 from .game import SnakeGame
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'tournament':
+        from .tournament import main as tournament_main
+        tournament_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        from .server import main as server_main
+        server_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'replay':
+        from .replay import main as replay_main
+        replay_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'arena':
+        from .arena import main as arena_main
+        arena_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        from .bench import main as bench_main
+        bench_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'fuzz':
+        from .fuzz import main as fuzz_main
+        fuzz_main(sys.argv[2:])
+        return
+        
     parser = argparse.ArgumentParser(description='Terminal Snake Game')
     parser.add_argument('-d', '--debug', action='store_true', 
                        help='Enable debug mode with JSON state dumps')
@@ -17,8 +43,26 @@ def main():
                        help='Sequence of moves: u(up), d(down), l(left), r(right), .(no move)')
     parser.add_argument('-g', '--game', action='store_true',
                        help='Skip menu and go directly to game')
+    parser.add_argument('--seed', type=int,
+                       help='Seed for food placement, to make a game reproducible')
+    parser.add_argument('--autopilot', action='store_true',
+                       help='Let the game play itself (A* to the food, falling back to a Hamiltonian cycle)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Time each phase of the game loop and print a summary on exit')
+    parser.add_argument('--debug-log', metavar='FILE',
+                       help='Write debug state as JSON Lines to FILE (or a pipe) instead of the terminal')
+    parser.add_argument('--debug-every', type=int, default=0, metavar='N',
+                       help='With --debug-log, also log every Nth tick')
+    parser.add_argument('--debug-events', default='eat,turn,died,won',
+                       help='With --debug-log, events that are always logged (default: eat,turn,died,won)')
+    parser.add_argument('--headless', action='store_true',
+                       help='Play --moves without rendering or delays and print the final state as JSON')
+    parser.add_argument('--record', metavar='FILE',
+                       help='Record the --moves (or --autopilot) run headlessly to a binary replay file')
     
     args = parser.parse_args()
+    if args.record and not (args.moves or args.autopilot):
+        parser.error('--record needs --moves or --autopilot')
     
     try:
         if os.name == 'nt':
@@ -26,8 +70,32 @@ def main():
             print("For Windows, consider using WSL or a Unix-compatible terminal.")
             
         moves = list(args.moves) if args.moves else None
-        game = SnakeGame(width=args.width, height=args.height, debug=args.debug, moves=moves, skip_menu=args.game)
-        game.run()
+        autopilot = None
+        if args.autopilot:
+            from .autopilot import Autopilot
+            autopilot = Autopilot(args.width, args.height)
+        game = SnakeGame(width=args.width, height=args.height, debug=args.debug, moves=moves,
+                         skip_menu=args.game or args.autopilot, seed=args.seed, autopilot=autopilot,
+                         profile=args.profile)
+        debug_log = None
+        if args.debug_log:
+            from .debuglog import DebugSink
+            debug_log = open(args.debug_log, 'w', encoding="utf-8")
+            events = [event for event in args.debug_events.split(',') if event]
+            DebugSink(debug_log, every=args.debug_every, events=events).attach(game)
+        try:
+            if args.record:
+                from .replay import record_moves
+                with open(args.record, 'wb') as stream:
+                    print(json.dumps(record_moves(stream, game)))
+            elif args.headless:
+                print(json.dumps(game.simulate()))
+            else:
+                game.run()
+        finally:
+            # Flush whatever was logged, also when the game raised or was interrupted
+            if debug_log:
+                debug_log.close()
         
     except Exception as e:
         print(f"An error occurred: {e}")
@@ -0,0 +1,103 @@
+"""
+Opt-in timing of the phases of the game loop.
+
+PhaseProfiler.attach(game) replaces the game's phase methods (key decoding,
+handle_input, move_snake, render_game, print_debug_state) on that instance
+with wrappers that time every call with time.perf_counter_ns(). Games
+without a profiler keep the plain methods, so profiling costs nothing
+unless it is switched on.
+
+Each phase keeps a fixed-size histogram with one bucket per power of two
+nanoseconds, plus an exact count, total and maximum, so memory stays
+constant however long the game runs. Percentiles are the upper bound of
+the bucket they fall in, so they are accurate to within a factor of two.
+"""
+
+import time
+from array import array
+from functools import wraps
+from typing import Callable, Dict, Optional
+
+# Method name -> phase name
+PHASES = {
+    'decode_keys': 'read_keys',
+    'handle_input': 'handle_input',
+    'move_snake': 'move_snake',
+    'render_game': 'render_game',
+    'print_debug_state': 'print_debug_state',
+}
+BUCKETS = 40  # Bucket b holds times below 2**b ns; the last one catches everything longer
+
+
+class PhaseHistogram:
+    __slots__ = ('counts', 'count', 'total_ns', 'max_ns')
+
+    def __init__(self):
+        self.counts = array('q', [0]) * BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, elapsed_ns: int):
+        self.counts[min(elapsed_ns.bit_length(), BUCKETS - 1)] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def percentile_us(self, percent: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = max(1, int(self.count * percent / 100 + 0.5))
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(1 << bucket, self.max_ns) / 1000
+        return self.max_ns / 1000
+
+    def get_stats(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_us": round(self.total_ns / self.count / 1000, 3) if self.count else None,
+            "p50_us": self.percentile_us(50),
+            "p99_us": self.percentile_us(99),
+            "max_us": self.max_ns / 1000,
+        }
+
+
+class PhaseProfiler:
+    def __init__(self):
+        self.histograms: Dict[str, PhaseHistogram] = {phase: PhaseHistogram() for phase in PHASES.values()}
+
+    def attach(self, game):
+        """Time game's phase methods from now on (this game instance only)"""
+        for method, phase in PHASES.items():
+            setattr(game, method, self.timed(phase, getattr(game, method)))
+        game.profiler = self
+
+    def timed(self, phase: str, func: Callable) -> Callable:
+        add = self.histograms[phase].add
+        perf_counter_ns = time.perf_counter_ns
+
+        @wraps(func)
+        def timed_call(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                add(perf_counter_ns() - start)
+
+        return timed_call
+
+    def get_stats(self) -> dict:
+        return {phase: histogram.get_stats() for phase, histogram in self.histograms.items()}
+
+    def summary(self) -> str:
+        """One line per phase that ran, for printing on exit"""
+        lines = [f"{'phase':18} {'count':>8} {'mean_us':>10} {'p50_us':>10} {'p99_us':>10} {'max_us':>10}"]
+        for phase, stats in self.get_stats().items():
+            if stats["count"]:
+                lines.append(f"{phase:18} {stats['count']:>8} {stats['mean_us']:>10.1f} {stats['p50_us']:>10.1f}"
+                             f" {stats['p99_us']:>10.1f} {stats['max_us']:>10.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,341 @@
+"""
+Terminal rendering for SnakeGame.
+
+FrameRenderer draws the whole screen once, then keeps track of what is on
+screen and sends only the cells that changed on later frames (normally the
+old tail, the new head and the food), using cursor-addressing escapes.
+Each frame is returned as one string so it can go out in a single write.
+
+The border and blank background never change, so they are prebuilt once per
+board size by static_rows(): each horizontal run of border cells shares one
+color escape, and blank runs are a single cursor-forward escape.
+
+Boards bigger than the terminal are shown through a viewport (set_view())
+that follows the head. When the head gets within a quarter of the view of
+its edge, the view jumps to centre on the head again, so scrolling costs one
+full redraw of the visible cells every few ticks instead of every tick, and
+no frame ever touches cells outside the view.
+
+Anything else shown under the board (the --debug state) is a footer drawn
+by the renderer at a fixed row, so it never scrolls the board out from
+under the diff frames' absolute cursor positions.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+
+class Colors:
+    RESET = '\033[0m'
+    RED = '\033[91m'
+    GREEN = '\033[92m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    MAGENTA = '\033[95m'
+    CYAN = '\033[96m'
+    WHITE = '\033[97m'
+    BOLD = '\033[1m'
+    BG_BLACK = '\033[40m'
+    BG_GREEN = '\033[42m'
+    BG_RED = '\033[41m'
+
+
+# Every cell is two terminal columns wide
+BORDER = '██'
+HEAD = '🐍'
+BODY = '🟢'
+FOOD = '🍎'
+EMPTY = '  '
+
+CLEAR_LINE = '\033[K'
+CLEAR_BELOW = '\033[J'
+
+BORDER_ON = Colors.CYAN + Colors.BOLD
+
+
+def skip(cells: int) -> str:
+    """Move the cursor right over blank cells (the screen was cleared) instead of printing them"""
+    return f'\033[{2 * cells}C' if cells > 0 else ''
+
+
+@lru_cache(maxsize=8)
+def static_rows(width: int, height: int, left: int = 0, top: int = 0,
+                columns: Optional[int] = None, rows: Optional[int] = None) -> Tuple[str, ...]:
+    """Board rows with only the border drawn, one color span per run of border cells
+
+    left, top, columns and rows select a window of the board (default: all of it).
+    """
+    columns = width if columns is None else columns
+    rows = height if rows is None else rows
+    right = left + columns
+    edge = f"{BORDER_ON}{BORDER * columns}{Colors.RESET}"
+    side = f"{BORDER_ON}{BORDER}{Colors.RESET}"
+    middle = ((side if left == 0 else '') + skip(min(right, width - 1) - max(left, 1))
+              + (side if right == width else ''))
+    return tuple(edge if y == 0 or y == height - 1 else middle for y in range(top, top + rows))
+
+
+class FrameRenderer:
+    GRID_TOP = 4  # Title, score line and a blank line sit above the board
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        # Visible window of the board, in cells; the whole board unless set_view() says otherwise
+        self.left = 0
+        self.top = 0
+        self.columns = width
+        self.rows = height
+        self.drawn: Dict[Tuple[int, int], str] = {}  # Snake/food cells currently on screen
+        # Snake and food as of the last frame, so a normal tick only looks at those cells
+        self.head: Optional[Tuple[int, int]] = None
+        self.tail: Optional[Tuple[int, int]] = None
+        self.length = 0
+        self.food: Optional[Tuple[int, int]] = None
+        self.scan = True  # Compare the whole snake with drawn next time (nothing to go on yet)
+        self.status: Optional[str] = None
+        self.speed: Optional[str] = None
+        self.footer = ''  # Text under the controls, see set_footer()
+        self.footer_lines = 0
+        self.footer_drawn = True
+        self.full_redraw = True
+        self.last_frame_bytes = 0  # Size of the last frame as sent to the terminal
+
+    def invalidate(self):
+        """Redraw the whole screen on the next frame"""
+        self.full_redraw = True
+        self.scan = True
+
+    def set_view(self, columns: int, rows: int):
+        """Show at most columns x rows cells of the board (e.g. to fit the terminal)"""
+        columns = max(1, min(self.width, columns))
+        rows = max(1, min(self.height, rows))
+        if (columns, rows) != (self.columns, self.rows):
+            self.columns, self.rows = columns, rows
+            self.left = min(self.left, self.width - columns)
+            self.top = min(self.top, self.height - rows)
+            self.full_redraw = True
+            self.scan = True
+
+    def set_footer(self, text: str):
+        """Show text under the board from the next frame on ('' for none)"""
+        if text != self.footer:
+            self.footer = text
+            self.footer_lines = text.count('\n') + 1 if text else 0
+            self.footer_drawn = False
+
+    def fit_terminal(self, size: Tuple[int, int]):
+        """Fit the view to a terminal of size (columns, lines), as from shutil.get_terminal_size()"""
+        # Title, status and gap above; gap, controls, speed, then the cursor line or the footer below
+        lines_around = self.GRID_TOP - 1 + 3 + max(1, self.footer_lines)
+        self.set_view(size[0] // 2, size[1] - lines_around)
+
+    def follow(self, head: Optional[Tuple[int, int]]):
+        """Recentre the view on head if it got too close to an edge (full redraw)"""
+        if head is None:
+            return
+        x, y = head
+        left, top = self.left, self.top
+        margin_x, margin_y = self.columns // 4, self.rows // 4
+        if (left > 0 and x < left + margin_x) or (left + self.columns < self.width
+                                                  and x >= left + self.columns - margin_x):
+            left = max(0, min(self.width - self.columns, x - self.columns // 2))
+        if (top > 0 and y < top + margin_y) or (top + self.rows < self.height
+                                                and y >= top + self.rows - margin_y):
+            top = max(0, min(self.height - self.rows, y - self.rows // 2))
+        if (left, top) != (self.left, self.top):
+            self.left, self.top = left, top
+            self.full_redraw = True
+            self.scan = True
+
+    def visible(self, cell: Tuple[int, int]) -> bool:
+        return (self.left <= cell[0] < self.left + self.columns
+                and self.top <= cell[1] < self.top + self.rows)
+
+    def move_to(self, x: int, y: int) -> str:
+        return f'\033[{self.GRID_TOP + y - self.top};{2 * (x - self.left) + 1}H'
+
+    def status_line(self, game) -> str:
+        return f"Score: {Colors.GREEN}{game.score}{Colors.RESET} | Direction: {Colors.CYAN}{game.direction.name}{Colors.RESET}"
+
+    def speed_line(self, game) -> str:
+        return f"{Colors.WHITE}Current speed: {game.game_speed_ms}ms per frame{Colors.RESET}"
+
+    def render(self, game) -> str:
+        """Return the escape sequences that bring the screen up to date with game"""
+        if self.columns < self.width or self.rows < self.height:
+            self.follow(game.body[0] if game.body else None)
+        if self.full_redraw:
+            return self.render_full(game)
+        updates = self.changed_cells(game)
+
+        # Cells written left to right on one row only need the first cursor move
+        parts = []
+        previous = None
+        for (x, y), glyph in sorted(updates.items(), key=lambda update: (update[0][1], update[0][0])):
+            if previous != (x - 1, y):
+                parts.append(self.move_to(x, y))
+            parts.append(glyph)
+            previous = (x, y)
+
+        status = self.status_line(game)
+        if status != self.status:
+            self.status = status
+            parts.append(f'\033[2;1H{status}{CLEAR_LINE}')
+        speed = self.speed_line(game)
+        if speed != self.speed:
+            self.speed = speed
+            parts.append(f'\033[{self.GRID_TOP + self.rows + 2};1H{speed}{CLEAR_LINE}')
+
+        # Leave the cursor under the board, where a full frame would leave it
+        parts.append(f'\033[{self.GRID_TOP + self.rows + 3};1H')
+        if not self.footer_drawn:
+            parts.append(self.footer_text())
+        return self.finish(''.join(parts))
+
+    def footer_text(self) -> str:
+        """The footer from the cursor line down, clearing whatever a longer one left behind"""
+        self.footer_drawn = True
+        return self.footer.replace('\n', CLEAR_LINE + '\n') + CLEAR_LINE + CLEAR_BELOW
+
+    def changed_cells(self, game) -> Dict[Tuple[int, int], str]:
+        """Visible cells whose glyph changed since the last frame (EMPTY where cleared)
+
+        Also records them as drawn. The terminal and web front ends both send
+        just these cells. When the snake moved at most one cell since the last
+        frame only the old and new head, tail and food are looked at;
+        anything else (a reset, several ticks in one frame, a new renderer)
+        falls back to comparing the whole snake with what is drawn.
+        """
+        snake = game.body
+        head = snake[0] if snake else None
+        length = len(snake)
+        if self.scan:
+            return self.scan_cells(game)
+        if head == self.head:
+            if length != self.length or (snake and snake[-1] != self.tail):
+                return self.scan_cells(game)
+            vacated = None
+        elif length == 1 and self.length == 1:
+            vacated = self.head
+        elif length > 1 and snake[1] == self.head and length == self.length:
+            vacated = self.tail
+        elif length > 1 and snake[1] == self.head and length == self.length + 1 and snake[-1] == self.tail:
+            vacated = None  # Ate: the tail stays put
+        else:
+            return self.scan_cells(game)
+
+        updates: Dict[Tuple[int, int], str] = {}
+        drawn = self.drawn
+        visible = self.visible
+        occupied = game.occupied
+        food = game.food
+
+        def put(cell, glyph):
+            if visible(cell) and drawn.get(cell) != glyph:
+                drawn[cell] = glyph
+                updates[cell] = glyph
+
+        for cell in (vacated, self.food):
+            if cell is not None and cell not in occupied and cell != food and cell in drawn:
+                del drawn[cell]
+                updates[cell] = EMPTY
+        if self.head is not None and self.head != head and self.head in occupied:
+            put(self.head, BODY)
+        if head is not None:
+            put(head, HEAD)
+        if food:
+            put(food, FOOD)
+        self.track(game)
+        return updates
+
+    def scan_cells(self, game) -> Dict[Tuple[int, int], str]:
+        """changed_cells() the slow way: O(snake length), for when the snake jumped"""
+        updates: Dict[Tuple[int, int], str] = {}
+        drawn = self.drawn
+
+        visible = self.visible
+
+        def put(cell, glyph):
+            if visible(cell) and drawn.get(cell) != glyph:
+                drawn[cell] = glyph
+                updates[cell] = glyph
+
+        # Cells that were snake or food last frame and are empty now
+        occupied = game.occupied
+        food = game.food
+        for cell in drawn.keys() - occupied:
+            if cell != food:
+                del drawn[cell]
+                updates[cell] = EMPTY
+
+        # Newly occupied cells other than the head
+        head = game.body[0] if game.body else None
+        for cell in occupied - drawn.keys():
+            if cell != head and visible(cell):
+                put(cell, BODY)
+        if self.head != head and self.head in occupied and visible(self.head):
+            put(self.head, BODY)
+        if head is not None:
+            put(head, HEAD)
+        if food:
+            put(food, FOOD)
+        self.track(game)
+        return updates
+
+    def track(self, game):
+        snake = game.body
+        self.head = snake[0] if snake else None
+        self.tail = snake[-1] if snake else None
+        self.length = len(snake)
+        self.food = game.food
+        self.scan = False
+
+    def render_full(self, game) -> str:
+        self.full_redraw = False
+        visible = self.visible
+        self.drawn = {cell: BODY for cell in game.body if visible(cell)}
+        self.track(game)
+        if self.head is not None and visible(self.head):
+            self.drawn[self.head] = HEAD
+        if game.food and visible(game.food):
+            self.drawn[game.food] = FOOD
+        self.status = self.status_line(game)
+        self.speed = self.speed_line(game)
+
+        rows: Dict[int, List[Tuple[int, str]]] = {}
+        for (x, y), glyph in self.drawn.items():
+            rows.setdefault(y, []).append((x, glyph))
+        side = f"{BORDER_ON}{BORDER}{Colors.RESET}"
+
+        parts = ['\033[2J\033[H',
+                 f"{Colors.YELLOW}{Colors.BOLD}🐍 SNAKE GAME 🐍{Colors.RESET}\n",
+                 f"{self.status}\n\n"]
+        left, right = self.left, self.left + self.columns
+        for y, row in enumerate(static_rows(self.width, self.height, left, self.top, self.columns, self.rows),
+                                self.top):
+            cells = rows.get(y)
+            if not cells:
+                parts.append(row)
+            else:
+                # Blank gaps between snake/food cells are skipped in one cursor move
+                x = max(left, 1)
+                if left == 0:
+                    parts.append(side)
+                for cell_x, glyph in sorted(cells):
+                    parts.append(skip(cell_x - x))
+                    parts.append(glyph)
+                    x = cell_x + 1
+                if right == self.width:
+                    parts.append(skip(self.width - 1 - x))
+                    parts.append(side)
+            parts.append('\n')
+        parts.append(f"\n{Colors.WHITE}Controls: Arrow keys or WASD to move, +/- to adjust speed, Q to quit{Colors.RESET}\n")
+        parts.append(f"{self.speed}\n")
+        if self.footer:
+            parts.append(self.footer_text())
+        return self.finish(''.join(parts))
+
+    def finish(self, frame: str) -> str:
+        self.last_frame_bytes = len(frame.encode('utf-8'))
+        return frame
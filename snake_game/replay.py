@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Compact binary replays.
+
+A replay stores the board size, the seed and, for every tick, the direction
+the snake moved in as 2 bits (four ticks per byte). That is enough to replay
+the whole game through the engine, because food placement only depends on
+the game's own RNG. Every ``keyframe_interval`` ticks a keyframe with the full game
+state (body, food, score, RNG state) is written, so a player can jump to any
+tick by restoring the nearest keyframe and stepping forward from there.
+
+File layout (little endian):
+
+    header    b'SNKR' version:u8 flags:u8 width:u16 height:u16 seed:u64 keyframe_interval:u32
+    blocks    b'K' tick:u32 size:u32 state[size]       full state after `tick` ticks
+              b'T' tick:u32 count:u32 packed[(count+3)//4]  directions for ticks tick+1..tick+count
+              b'E' ticks:u32 event:u8                  end of the game
+
+Blocks are written as the game goes, so recording streams with a buffer of
+one keyframe interval. Games recorded without a seed start with a keyframe.
+"""
+
+import argparse
+import json
+import struct
+import sys
+import time
+from array import array
+from collections import deque
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .core import DIRECTION_CODES, DIRECTIONS, MOVES, GameRandom
+from .game import FreeCells, GameState, SnakeGame, TickEvent
+
+MAGIC = b'SNKR'
+VERSION = 2  # 2: RNG state is the 64-bit GameRandom state
+HAS_SEED = 1
+
+HEADER = struct.Struct('<4sBBHHQI')
+BLOCK = struct.Struct('<cII')
+END = struct.Struct('<cIB')
+STATE = struct.Struct('<IHBBiiIIQ')
+
+STATES = list(GameState)
+EVENTS = [None, TickEvent.DIED, TickEvent.WON]
+
+
+def pack_state(game: SnakeGame) -> bytes:
+    """Everything needed to continue the game exactly, including the RNG"""
+    food_x, food_y = game.food if game.food else (-1, -1)
+    body = array('H')
+    for x, y in game.snake:
+        body.append(x)
+        body.append(y)
+    free_cells = game.free_cells.cells
+    free = free_cells.tobytes() if free_cells is not None else b''
+    header = STATE.pack(game.score, game.game_speed_ms, DIRECTION_CODES[game.direction],
+                        STATES.index(game.state), food_x, food_y, len(game.snake),
+                        len(free_cells) if free_cells is not None else 0xFFFFFFFF,
+                        game.rng.getstate())
+    return header + body.tobytes() + free
+
+
+def unpack_state(data: bytes, game: SnakeGame):
+    """Restore a state written by pack_state into game"""
+    (game.score, game.game_speed_ms, direction, state, food_x, food_y,
+     length, free_count, rng_state) = STATE.unpack_from(data)
+    offset = STATE.size
+    body = array('H')
+    body.frombytes(data[offset:offset + 4 * length])
+    offset += 4 * length
+    game.direction = DIRECTIONS[direction]
+    game.state = STATES[state]
+    game.food = (food_x, food_y) if food_x >= 0 else None
+    game.snake = deque(zip(body[0::2], body[1::2]))
+    game.occupied = set(game.snake)
+    game.free_cells = FreeCells(game.width, game.height, game.occupied)
+    if free_count != 0xFFFFFFFF:
+        # The free-cell order decides which cell each draw lands on, so it is restored as is
+        cells = array('i')
+        cells.frombytes(data[offset:offset + 4 * free_count])
+        offset += 4 * free_count
+        positions = array('i', [-1]) * game.free_cells.size
+        for slot, index in enumerate(cells):
+            positions[index] = slot
+        game.free_cells.cells = cells
+        game.free_cells.positions = positions
+    game.rng.setstate(rng_state)
+
+
+class ReplayWriter:
+    def __init__(self, stream: BinaryIO, game: SnakeGame, keyframe_interval: int = 4096):
+        """Start recording game, which must not have moved yet
+
+        Args:
+            stream: Binary file to write to
+            game: The game to record; games created without a seed start
+                with a keyframe instead
+            keyframe_interval: Ticks between full-state keyframes
+        """
+        seed = game.seed
+        self.stream = stream
+        self.keyframe_interval = keyframe_interval
+        self.ticks = 0
+        self.pending = bytearray()
+        self.pending_count = 0
+        stream.write(HEADER.pack(MAGIC, VERSION, HAS_SEED if seed is not None else 0,
+                                 game.width, game.height, (seed or 0) & GameRandom.MASK, keyframe_interval))
+        if seed is None:
+            self.write_keyframe(game)
+
+    def write_keyframe(self, game: SnakeGame):
+        state = pack_state(game)
+        self.stream.write(BLOCK.pack(b'K', self.ticks, len(state)))
+        self.stream.write(state)
+
+    def flush_ticks(self):
+        if self.pending_count:
+            self.stream.write(BLOCK.pack(b'T', self.ticks - self.pending_count, self.pending_count))
+            self.stream.write(bytes(self.pending))
+            self.pending = bytearray()
+            self.pending_count = 0
+
+    def record(self, game: SnakeGame):
+        """Call after every tick of game"""
+        code = DIRECTION_CODES[game.direction]
+        slot = self.pending_count % 4
+        if slot == 0:
+            self.pending.append(code)
+        else:
+            self.pending[-1] |= code << (2 * slot)
+        self.pending_count += 1
+        self.ticks += 1
+        if self.ticks % self.keyframe_interval == 0:
+            self.flush_ticks()
+            self.write_keyframe(game)
+
+    def close(self, event: Optional[TickEvent] = None):
+        self.flush_ticks()
+        self.stream.write(END.pack(b'E', self.ticks, EVENTS.index(event) if event in EVENTS else 0))
+        self.stream.flush()
+
+
+def record_moves(stream: BinaryIO, game: SnakeGame, moves: Optional[Iterable[str]] = None,
+                 keyframe_interval: int = 4096) -> dict:
+    """Play moves headlessly while recording them, and return the final state
+
+    Without moves the game plays its own --moves list or autopilot, like simulate().
+    """
+    writer = ReplayWriter(stream, game, keyframe_interval=keyframe_interval)
+    game.start()
+    if moves is None:
+        moves = iter(game.get_next_move, None)
+    event = None
+    for move in moves:
+        if game.state is not GameState.PLAYING:
+            break
+        event = game.step(move)
+        writer.record(game)
+        if event is TickEvent.DIED or event is TickEvent.WON:
+            break
+    writer.close(event if event in EVENTS else None)
+    return game.get_debug_state()
+
+
+class ReplayReader:
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        magic, version, flags, self.width, self.height, seed, self.keyframe_interval = \
+            HEADER.unpack(stream.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a snake replay file")
+        self.seed = seed if flags & HAS_SEED else None
+        self.start = stream.tell()
+        self.keyframes: Optional[List[Tuple[int, int]]] = None  # (tick, file offset), built on first seek
+        self.total_ticks: Optional[int] = None
+        self.final_event: Optional[TickEvent] = None
+
+    def read_block(self):
+        kind = self.stream.read(1)
+        if kind == b'E':
+            _, ticks, event = END.unpack(kind + self.stream.read(END.size - 1))
+            self.total_ticks = ticks
+            self.final_event = EVENTS[event]
+            return kind, ticks, 0
+        if not kind:
+            return b'', 0, 0
+        _, tick, size = BLOCK.unpack(kind + self.stream.read(BLOCK.size - 1))
+        return kind, tick, size
+
+    def index(self) -> List[Tuple[int, int]]:
+        """Offsets of all keyframes, found by hopping over block headers"""
+        if self.keyframes is None:
+            self.keyframes = []
+            self.stream.seek(self.start)
+            while True:
+                offset = self.stream.tell()
+                kind, tick, size = self.read_block()
+                if kind == b'K':
+                    self.keyframes.append((tick, offset))
+                    self.stream.seek(size, 1)
+                elif kind == b'T':
+                    self.stream.seek((size + 3) // 4, 1)
+                else:
+                    break
+        return self.keyframes
+
+    def new_game(self) -> SnakeGame:
+        return SnakeGame(width=self.width, height=self.height, debug=False, skip_menu=True, seed=self.seed)
+
+    def frames(self, start_tick: int = 0) -> Iterator[SnakeGame]:
+        """Yield the game after every tick from start_tick on, stepping the engine lazily
+
+        The same SnakeGame object is yielded each time, updated in place, so
+        frames() starts with the game before its first tick whether or not
+        the replay has a seed.
+        """
+        game = self.new_game()
+        position, tick = self.start, 0
+        for keyframe_tick, offset in self.index():
+            if keyframe_tick <= start_tick:
+                position, tick = offset, keyframe_tick
+        self.stream.seek(position)
+
+        # A seeded game starts from its seed rather than a keyframe
+        restored = position == self.start and self.seed is not None
+        if restored and start_tick == 0:
+            yield game
+        while True:
+            kind, block_tick, size = self.read_block()
+            if kind == b'K':
+                if restored:
+                    self.stream.seek(size, 1)
+                else:
+                    unpack_state(self.stream.read(size), game)
+                    restored = True
+                    if tick == start_tick:
+                        yield game
+            elif kind == b'T':
+                packed = self.stream.read((size + 3) // 4)
+                if block_tick + size <= tick:
+                    continue
+                for index in range(tick - block_tick, size):
+                    code = (packed[index // 4] >> (2 * (index % 4))) & 3
+                    game.step(MOVES[code])
+                    tick += 1
+                    if tick >= start_tick:
+                        yield game
+                restored = True
+            else:
+                return
+
+    def game_at(self, tick: int) -> SnakeGame:
+        """The game as it was after `tick` ticks"""
+        for game in self.frames(tick):
+            return game
+        raise IndexError(f"Replay only has {self.total_ticks} ticks")
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(prog='snake-game replay', description='Inspect or play back a replay')
+    parser.add_argument('file', help='Replay file')
+    parser.add_argument('-t', '--tick', type=int,
+                       help='Print the game state after this many ticks')
+    parser.add_argument('--play', action='store_true',
+                       help='Play the replay back in the terminal')
+
+    args = parser.parse_args(argv)
+    with open(args.file, 'rb') as stream:
+        reader = ReplayReader(stream)
+        if args.tick is not None:
+            print(json.dumps(reader.game_at(args.tick).get_debug_state(), indent=2))
+        elif args.play:
+            for game in reader.frames(1):
+                sys.stdout.write(game.renderer.render(game))
+                sys.stdout.flush()
+                time.sleep(game.game_speed_ms / 1000)
+        else:
+            reader.index()
+            print(json.dumps({
+                "width": reader.width,
+                "height": reader.height,
+                "seed": reader.seed,
+                "ticks": reader.total_ticks,
+                "keyframes": len(reader.keyframes),
+                "final_event": reader.final_event.value if reader.final_event else None,
+            }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Serve many Snake games from one process.
+
+Every TCP (or unix socket) connection gets its own session in a single
+asyncio event loop. Each game runs on its own tick schedule via
+SnakeGame.play() and streams the renderer's diff frames to the client, so
+a client only needs a raw-mode terminal:
+
+    snake-game serve --port 7777
+    stty raw -echo; nc localhost 7777; stty sane
+
+Sessions that are not playing (before the first key, or after a game ends)
+hold no game state, only the connection.
+"""
+
+import argparse
+import asyncio
+from typing import Optional, Sequence, Set
+
+from .clock import TickClock
+from .game import SnakeGame, TickEvent
+from .keys import KeyDecoder, queue_keys
+from .render import Colors
+
+MAX_WRITE_BUFFER = 64 * 1024  # Skip frames for clients this far behind; the next diff catches up
+CLOCK_SAMPLES = 32  # Jitter samples per session (the terminal game keeps 1024)
+
+WELCOME = (f"\033[2J\033[H{Colors.YELLOW}{Colors.BOLD}🐍 SNAKE GAME 🐍{Colors.RESET}\n\n"
+           "Arrow keys or WASD to move, +/- to adjust speed, Q to quit\n"
+           "Press any key to start\n")
+PLAY_AGAIN = "Press R to play again or Q to quit\n"
+
+
+class Session:
+    __slots__ = ('server', 'reader', 'writer', 'keys', 'game')
+
+    def __init__(self, server: 'GameServer', reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.keys: asyncio.Queue = asyncio.Queue()
+        self.game: Optional[SnakeGame] = None
+
+    def send(self, text: str):
+        if not self.writer.is_closing():
+            # Clients run raw terminals, which don't turn \n into \r\n
+            self.writer.write(text.replace('\n', '\r\n').encode('utf-8'))
+
+    async def read_input(self):
+        decoder = KeyDecoder()
+        while True:
+            data = await self.reader.read(1024)
+            if not data:
+                self.keys.put_nowait(None)
+                return
+            queue_keys(decoder, data, self.keys)
+
+    def draw(self):
+        transport = self.writer.transport
+        if transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            return
+        self.send(self.game.renderer.render(self.game))
+
+    async def play(self) -> Optional[TickEvent]:
+        game = self.game = SnakeGame(width=self.server.width, height=self.server.height,
+                                     debug=False, skip_menu=True)
+        try:
+            event = await game.play(self.keys, self.draw, clock=TickClock(game.game_speed_ms, samples=CLOCK_SAMPLES))
+            if event is not None:
+                self.send(game.renderer.render(game))
+                if event is TickEvent.WON:
+                    self.send(f"\n{Colors.GREEN}{Colors.BOLD}YOU WIN!{Colors.RESET}\n")
+                else:
+                    self.send(f"\n{Colors.RED}{Colors.BOLD}GAME OVER!{Colors.RESET}\n")
+                self.send(f"Final Score: {Colors.YELLOW}{game.score}{Colors.RESET}\n{PLAY_AGAIN}")
+            return event
+        finally:
+            self.game = None
+
+    async def run(self):
+        input_task = asyncio.ensure_future(self.read_input())
+        try:
+            self.send(WELCOME)
+            while True:
+                key = await self.keys.get()
+                if key is None or key.lower() == 'q':
+                    break
+                if await self.play() is None:
+                    break  # Quit or disconnected mid-game
+                # Wait for R (or Q) before starting over
+                while True:
+                    key = await self.keys.get()
+                    if key is None or key.lower() in ('q', 'r'):
+                        break
+                if key is None or key.lower() != 'r':
+                    break
+        finally:
+            input_task.cancel()
+            self.writer.close()
+
+
+class GameServer:
+    def __init__(self, width: int = 40, height: int = 20, max_sessions: int = 10000):
+        self.width = width
+        self.height = height
+        self.max_sessions = max_sessions
+        self.sessions: Set[Session] = set()
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if len(self.sessions) >= self.max_sessions:
+            writer.write(b"Server full, try again later\r\n")
+            writer.close()
+            return
+        session = Session(self, reader, writer)
+        self.sessions.add(session)
+        try:
+            await session.run()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions.discard(session)
+
+    def playing(self) -> int:
+        return sum(1 for session in self.sessions if session.game is not None)
+
+    async def start(self, host: str = '127.0.0.1', port: int = 7777, unix_path: Optional[str] = None):
+        if unix_path:
+            return await asyncio.start_unix_server(self.handle_client, path=unix_path)
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 7777, unix_path: Optional[str] = None):
+        server = await self.start(host, port, unix_path)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(prog='snake-game serve',
+                                     description='Host many Snake games in one process')
+    parser.add_argument('--host', default='127.0.0.1',
+                       help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('-p', '--port', type=int, default=7777,
+                       help='TCP port (default: 7777)')
+    parser.add_argument('--unix', dest='unix_path',
+                       help='Listen on a unix socket instead of TCP')
+    parser.add_argument('--width', type=int, default=40,
+                       help='Game width (default: 40)')
+    parser.add_argument('--height', type=int, default=20,
+                       help='Game height (default: 20)')
+    parser.add_argument('--max-sessions', type=int, default=10000,
+                       help='Most concurrent connections (default: 10000)')
+
+    args = parser.parse_args(argv)
+    server = GameServer(width=args.width, height=args.height, max_sessions=args.max_sessions)
+    where = args.unix_path or f"{args.host}:{args.port}"
+    print(f"Serving Snake on {where}")
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix_path))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""
+Immutable game states for search-based bots.
+
+A GameSnapshot holds everything that decides how a game continues:
+
+    head, tail   end cells of the snake
+    segments     the direction of every body segment, 2 bits each, in a ring
+                 indexed by tick: the head end is at `tick`, the tail end at
+                 `tick - length + 2`
+    occupied     bitmask of body cells over the board interior, 64 cells to a word
+
+segments and occupied are persistent tries of 64-slot tuples (see
+trie_update()). apply(direction) writes the new head's segment and flips
+the head and tail occupancy bits by copying one root-to-leaf path per
+change, and keeps a Zobrist-style body key up to date for hashing. That is
+O(depth) per tick, whatever the snake length: one level up to 4096 cells,
+two up to 131072 (about 360x360). Everything else is shared between a
+snapshot and its children, so searches can branch from any state without
+copying the snake body or the board.
+
+Real costs: apply() is about 7-15us here on any board, where packing the
+whole board into one integer cost 3us on small boards but grew with the
+snake (200us for a 500000-cell snake). Eating past half full scans the
+occupancy words to draw food (see sample_food()). Snapshots are hashable
+and compare by value, so they can key transposition tables directly;
+comparing two snapshots with equal hashes walks both bodies, O(length).
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Iterator, Optional, Tuple
+
+from .core import DIRECTION_CODES, DIRECTIONS, Direction, FreeCells, GameRandom, GameState, OPPOSITE_DIRECTIONS, TickEvent
+
+TRIE_BITS = 6
+TRIE_SLOTS = 1 << TRIE_BITS
+TRIE_MASK = TRIE_SLOTS - 1
+EMPTY_TRIES = [(0,) * TRIE_SLOTS]  # Empty trie of each depth
+
+
+def trie_depth(size: int) -> int:
+    """Levels above the leaves for a trie of at least size slots"""
+    depth = 0
+    while TRIE_SLOTS ** (depth + 1) < size:
+        depth += 1
+    return depth
+
+
+def empty_trie(depth: int) -> tuple:
+    while len(EMPTY_TRIES) <= depth:
+        EMPTY_TRIES.append((EMPTY_TRIES[-1],) * TRIE_SLOTS)
+    return EMPTY_TRIES[depth]
+
+
+def trie_get(node: tuple, depth: int, index: int) -> int:
+    while depth:
+        node = node[(index >> (TRIE_BITS * depth)) & TRIE_MASK]
+        depth -= 1
+    return node[index & TRIE_MASK]
+
+
+def trie_update(node: tuple, depth: int, index: int, clear: int, bits: int) -> tuple:
+    """A copy of the trie with slot index set to (slot & ~clear) ^ bits; only the nodes on its path are new"""
+    parents = []
+    while depth:
+        slot = (index >> (TRIE_BITS * depth)) & TRIE_MASK
+        parents.append((node, slot))
+        node = node[slot]
+        depth -= 1
+    slot = index & TRIE_MASK
+    node = node[:slot] + ((node[slot] & ~clear) ^ bits,) + node[slot + 1:]
+    for parent, slot in reversed(parents):
+        node = parent[:slot] + (node,) + parent[slot + 1:]
+    return node
+
+
+class Layout:
+    """Trie shapes for one board size, shared by every snapshot of that size"""
+
+    __slots__ = ('inner_width', 'size', 'words', 'occupied_depth', 'segment_depth', 'ring_mask')
+
+    def __init__(self, width: int, height: int):
+        self.inner_width = width - 2
+        self.size = (width - 2) * (height - 2)
+        self.words = (self.size + 63) // 64  # 64 cells to an occupancy word
+        self.occupied_depth = trie_depth(self.words)
+        # 32 segments to a word, and the ring has room for a snake filling the whole board
+        self.segment_depth = trie_depth((self.size + 31) // 32)
+        self.ring_mask = 32 * TRIE_SLOTS ** (self.segment_depth + 1) - 1
+
+
+@lru_cache(maxsize=64)
+def layout(width: int, height: int) -> Layout:
+    return Layout(width, height)
+
+
+def cell_key(index: int) -> int:
+    """Hash contribution of a body cell; the body's key is the XOR of its cells'"""
+    z = (index + 1) * 0x9E3779B97F4A7C15 & GameRandom.MASK
+    return z ^ (z >> 29)
+
+
+class GameSnapshot:
+    """Read-only state of one SnakeGame; apply() returns new snapshots"""
+
+    __slots__ = ('width', 'height', 'layout', 'head', 'tail', 'length', 'tick', 'segments', 'occupied', 'body_key',
+                 'direction', 'food', 'score', 'game_speed_ms', 'state', 'rng_state', 'event', 'hash')
+
+    def __init__(self, width: int, height: int, head: Tuple[int, int], tail: Tuple[int, int],
+                 length: int, tick: int, segments: tuple, occupied: tuple, body_key: int, direction: Direction,
+                 food: Optional[Tuple[int, int]], score: int, game_speed_ms: int, state: GameState, rng_state: int,
+                 event: Optional[TickEvent] = None):
+        self.width = width
+        self.height = height
+        self.layout = layout(width, height)
+        self.head = head
+        self.tail = tail
+        self.length = length
+        self.tick = tick  # Ring position of the newest segment
+        self.segments = segments
+        self.occupied = occupied
+        self.body_key = body_key
+        self.direction = direction
+        self.food = food
+        self.score = score
+        self.game_speed_ms = game_speed_ms
+        self.state = state
+        self.rng_state = rng_state
+        self.event = event  # What the tick that led here did, None for a snapshot of a game
+        self.hash: Optional[int] = None  # Worked out on first use, since most snapshots are never hashed
+
+    @classmethod
+    def from_game(cls, game) -> 'GameSnapshot':
+        shape = layout(game.width, game.height)
+        inner_width = shape.inner_width
+        segments = empty_trie(shape.segment_depth)
+        occupied = empty_trie(shape.occupied_depth)
+        body_key = 0
+        tick = -1
+        previous = None
+        for x, y in reversed(game.snake):
+            index = (y - 1) * inner_width + x - 1
+            occupied = trie_update(occupied, shape.occupied_depth, index >> 6, 0, 1 << (index & 63))
+            body_key ^= cell_key(index)
+            if previous is not None:
+                tick += 1
+                step = (x - previous[0], y - previous[1])
+                segments = trie_update(segments, shape.segment_depth, tick >> 5, 0,
+                                        DIRECTION_CODES[Direction(step)] << 2 * (tick & 31))
+            previous = (x, y)
+        return cls(game.width, game.height, game.snake[0], game.snake[-1], len(game.snake), tick, segments,
+                   occupied, body_key, game.direction, game.food, game.score, game.game_speed_ms, game.state,
+                   game.rng.getstate())
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, GameSnapshot):
+            return NotImplemented
+        return (hash(self) == hash(other) and self.head == other.head and self.length == other.length
+                and self.body_key == other.body_key and self.direction is other.direction
+                and self.food == other.food and self.state is other.state
+                and self.rng_state == other.rng_state
+                and (self.width, self.height) == (other.width, other.height)
+                and all(a == b for a, b in zip(self.body(), other.body())))
+
+    def __hash__(self) -> int:
+        if self.hash is None:
+            self.hash = hash((self.width, self.height, self.head, self.length, self.body_key, self.direction,
+                              self.food, self.state, self.rng_state))
+        return self.hash
+
+    def clone(self) -> 'GameSnapshot':
+        """Snapshots never change, so a clone is the snapshot itself"""
+        return self
+
+    def segment(self, tick: int) -> Direction:
+        shape = self.layout
+        tick &= shape.ring_mask
+        return DIRECTIONS[trie_get(self.segments, shape.segment_depth, tick >> 5) >> 2 * (tick & 31) & 3]
+
+    def body(self) -> Iterator[Tuple[int, int]]:
+        """Cells of the snake from head to tail"""
+        x, y = self.head
+        yield x, y
+        for tick in range(self.tick, self.tick - self.length + 1, -1):
+            dx, dy = self.segment(tick).value
+            x, y = x - dx, y - dy
+            yield x, y
+
+    def cell_index(self, cell: Tuple[int, int]) -> int:
+        return (cell[1] - 1) * self.layout.inner_width + cell[0] - 1
+
+    def occupied_bit(self, index: int) -> bool:
+        return bool(trie_get(self.occupied, self.layout.occupied_depth, index >> 6) >> (index & 63) & 1)
+
+    def is_blocked(self, cell: Tuple[int, int]) -> bool:
+        """True for walls and body cells"""
+        x, y = cell
+        if x <= 0 or x >= self.width - 1 or y <= 0 or y >= self.height - 1:
+            return True
+        return self.occupied_bit(self.cell_index(cell))
+
+    def apply(self, direction: Optional[Direction] = None) -> 'GameSnapshot':
+        """The state after one tick, following the same rules as SnakeGame.step()
+
+        Turning back on yourself is ignored, like change_direction(). A
+        snapshot of a finished game is returned unchanged.
+        """
+        if self.state is not GameState.PLAYING:
+            return self
+        if direction is None or direction is OPPOSITE_DIRECTIONS[self.direction]:
+            direction = self.direction
+        width, height = self.width, self.height
+        shape = self.layout
+        dx, dy = direction.value
+        x, y = self.head[0] + dx, self.head[1] + dy
+        head = (x, y)
+        index = (y - 1) * shape.inner_width + x - 1
+        if (not (0 < x < width - 1 and 0 < y < height - 1)
+                or trie_get(self.occupied, shape.occupied_depth, index >> 6) >> (index & 63) & 1):
+            return GameSnapshot(width, height, self.head, self.tail, self.length, self.tick, self.segments,
+                                self.occupied, self.body_key, direction, self.food, self.score, self.game_speed_ms,
+                                GameState.GAME_OVER, self.rng_state, TickEvent.DIED)
+
+        tick = self.tick + 1
+        slot = tick & shape.ring_mask
+        shift = 2 * (slot & 31)
+        segments = trie_update(self.segments, shape.segment_depth, slot >> 5, 3 << shift,
+                               DIRECTION_CODES[direction] << shift)
+        occupied = trie_update(self.occupied, shape.occupied_depth, index >> 6, 0, 1 << (index & 63))
+        body_key = self.body_key ^ cell_key(index)
+        if head == self.food:
+            length = self.length + 1
+            rng = GameRandom()
+            rng.setstate(self.rng_state)
+            food = self.sample_food(occupied, length, rng)
+            state = GameState.PLAYING if food is not None else GameState.WON
+            speed = self.game_speed_ms - 5 if self.game_speed_ms > 50 else self.game_speed_ms
+            return GameSnapshot(width, height, head, self.tail, length, tick, segments, occupied, body_key,
+                                direction, food, self.score + 10, speed, state, rng.getstate(),
+                                TickEvent.WON if food is None else TickEvent.EAT)
+
+        # The oldest segment says which way the tail moves
+        length = self.length
+        if length == 1:
+            tail = head
+        else:
+            tail_dx, tail_dy = self.segment(self.tick - length + 2).value
+            tail = (self.tail[0] + tail_dx, self.tail[1] + tail_dy)
+        tail_index = (self.tail[1] - 1) * shape.inner_width + self.tail[0] - 1
+        occupied = trie_update(occupied, shape.occupied_depth, tail_index >> 6, 0, 1 << (tail_index & 63))
+        body_key ^= cell_key(tail_index)
+        return GameSnapshot(width, height, head, tail, length, tick, segments, occupied, body_key, direction,
+                            self.food, self.score, self.game_speed_ms, GameState.PLAYING, self.rng_state,
+                            TickEvent.MOVE)
+
+    def sample_food(self, occupied: tuple, length: int, rng: GameRandom) -> Optional[Tuple[int, int]]:
+        """Draw a free cell the way FreeCells does
+
+        While the board is at least half free this is the same cell the game
+        would pick, in O(1). After that the game draws from its own free-cell
+        order, which a snapshot doesn't keep, so the pick is still uniform but
+        may be a different cell, and finding it scans the occupancy words
+        (O(area / 64), on eating ticks only).
+        """
+        shape = self.layout
+        inner_width, size = shape.inner_width, shape.size
+        free = size - length
+        if free <= 0:
+            return None
+        depth = shape.occupied_depth
+        if free * 2 > size:
+            while True:
+                index = rng.randrange(size)
+                if not trie_get(occupied, depth, index >> 6) >> (index & 63) & 1:
+                    return (index % inner_width + 1, index // inner_width + 1)
+        # The k-th free cell in board order
+        remaining = rng.randrange(free)
+        for word_index in range(shape.words):
+            cells = min(64, size - word_index * 64)
+            free_bits = ~trie_get(occupied, depth, word_index) & ((1 << cells) - 1)
+            count = bin(free_bits).count('1')
+            if remaining < count:
+                for bit in range(cells):
+                    if free_bits >> bit & 1:
+                        if remaining == 0:
+                            index = word_index * 64 + bit
+                            return (index % inner_width + 1, index // inner_width + 1)
+                        remaining -= 1
+            remaining -= count
+        return None
+
+    def restore(self, game):
+        """Put game into this state"""
+        game.snake = deque(self.body())
+        game.occupied = set(game.snake)
+        game.free_cells = FreeCells(game.width, game.height, game.occupied)
+        game.direction = self.direction
+        game.food = self.food
+        game.score = self.score
+        game.game_speed_ms = self.game_speed_ms
+        game.state = self.state
+        game.rng.setstate(self.rng_state)
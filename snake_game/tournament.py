@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Score many --moves scripts (and/or seeds) in parallel across a process pool.
+
+    snake-game tournament scripts.txt --seeds 10 --json results.json --csv games.csv
+
+Every script is played headlessly with SnakeGame.simulate() once per seed,
+and the final score, length and survival ticks of each game are aggregated.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from .game import SnakeGame
+
+RESULT_FIELDS = ["script", "seed", "state", "score", "length", "ticks"]
+
+
+def play(width: int, height: int, job: Tuple[int, str, Optional[int]]) -> dict:
+    """Play one script headlessly and return its result row"""
+    script_index, script, seed = job
+    game = SnakeGame(width=width, height=height, debug=False, moves=list(script), seed=seed)
+    final = game.simulate()
+    return {
+        "script": script_index,
+        "seed": seed,
+        "state": final["state"],
+        "score": final["score"],
+        "length": final["snake_length"],
+        "ticks": final["ticks"],
+    }
+
+
+def run_tournament(scripts: Sequence[str], seeds: Sequence[Optional[int]] = (None,),
+                   width: int = 80, height: int = 40, workers: Optional[int] = None) -> List[dict]:
+    """Play every script with every seed, fanned out over a process pool
+
+    Returns:
+        list: One result row per (script, seed), in input order
+    """
+    jobs = [(index, script, seed) for index, script in enumerate(scripts) for seed in seeds]
+    if not jobs:
+        return []
+    workers = workers or os.cpu_count() or 1
+    worker = partial(play, width, height)
+    if workers == 1:
+        return [worker(job) for job in jobs]
+    # Big chunks keep pickling overhead low for ~100k short scripts
+    chunksize = max(1, len(jobs) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(worker, jobs, chunksize=chunksize))
+
+
+def summarize(results: Iterable[dict]) -> dict:
+    results = list(results)
+    summary = {"games": len(results)}
+    for field in ("score", "length", "ticks"):
+        values = [result[field] for result in results]
+        summary[field] = {
+            "mean": sum(values) / len(values) if values else 0,
+            "min": min(values, default=0),
+            "max": max(values, default=0),
+        }
+    states = {}
+    for result in results:
+        states[result["state"]] = states.get(result["state"], 0) + 1
+    summary["states"] = states
+    return summary
+
+
+def read_scripts(paths: Sequence[str]) -> List[str]:
+    """One script per line; '-' reads stdin. Blank lines and #comments are skipped"""
+    scripts = []
+    for path in paths:
+        handle = sys.stdin if path == '-' else open(path, encoding="utf-8")
+        try:
+            for line in handle:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    scripts.append(line)
+        finally:
+            if handle is not sys.stdin:
+                handle.close()
+    return scripts
+
+
+def parse_seeds(value: str) -> List[int]:
+    """'10' -> seeds 0..9, '5:8' -> 5..7, '1,7,42' -> those seeds"""
+    if ':' in value:
+        start, stop = value.split(':', 1)
+        return list(range(int(start), int(stop)))
+    if ',' in value:
+        return [int(seed) for seed in value.split(',')]
+    return list(range(int(value)))
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(prog='snake-game tournament',
+                                     description='Score many move scripts in parallel')
+    parser.add_argument('files', nargs='*',
+                       help="Files with one move script per line ('-' for stdin)")
+    parser.add_argument('-m', '--moves', action='append', default=[],
+                       help='A move script (u/d/l/r/.); may be repeated')
+    parser.add_argument('-s', '--seeds', type=parse_seeds, default=None,
+                       help="Seeds to play every script with: N, START:STOP or a,b,c (default: one unseeded game)")
+    parser.add_argument('--width', type=int, default=80,
+                       help='Game width (default: 80)')
+    parser.add_argument('--height', type=int, default=40,
+                       help='Game height (default: 40)')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                       help='Worker processes (default: all cores)')
+    parser.add_argument('--json', dest='json_path',
+                       help='Write summary and per-game results as JSON')
+    parser.add_argument('--csv', dest='csv_path',
+                       help='Write per-game results as CSV')
+
+    args = parser.parse_args(argv)
+    scripts = args.moves + read_scripts(args.files)
+    if not scripts:
+        parser.error('no move scripts given')
+
+    results = run_tournament(scripts, seeds=args.seeds or [None], width=args.width,
+                             height=args.height, workers=args.workers)
+    summary = summarize(results)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding="utf-8") as handle:
+            json.dump({"summary": summary, "games": results}, handle)
+    if args.csv_path:
+        with open(args.csv_path, 'w', newline='', encoding="utf-8") as handle:
+            writer = csv.DictWriter(handle, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Browser front end support.
+
+snake_web.html loads this package into Pyodide and drives a WebGame, so the
+web page plays the very same SnakeGame engine as the terminal. Once per
+frame the page calls tick(keys), which hands the keys to the game, advances
+one tick and returns the cells that changed as compact JSON; the page
+patches just those cells in its grid.
+
+Only core, game, clock and render are needed besides this module (see
+PACKAGE_FILES in snake_web.html); nothing here touches a terminal.
+"""
+
+import json
+from typing import Optional
+
+from .core import GameState, TickEvent
+from .game import SnakeGame
+from .render import BODY, EMPTY, FOOD, HEAD, FrameRenderer
+
+# Glyphs as sent to the page: h(ead), b(ody), f(ood) or ' ' for a cleared cell
+GLYPH_CODES = {HEAD: 'h', BODY: 'b', FOOD: 'f', EMPTY: ' '}
+
+
+class WebGame:
+    def __init__(self, width: int = 30, height: int = 40, seed: Optional[int] = None):
+        """A game sized for the page (narrower than the terminal default, for phones)"""
+        self.game = SnakeGame(width=width, height=height, debug=False, skip_menu=True, seed=seed)
+        self.width = width
+        self.height = height
+        self.renderer = FrameRenderer(width, height)
+
+    def start(self) -> str:
+        """The whole board as a diff against an empty grid, for the first frame"""
+        self.renderer = FrameRenderer(self.width, self.height)
+        return self.frame_diff()
+
+    def tick(self, keys: str = '') -> str:
+        """Handle keys, advance one tick and return what changed as JSON
+
+        This is the page's only call into Python per frame. Turns go through
+        the game's turn queue, so several quick turns play out over the next
+        ticks instead of overwriting each other.
+        """
+        game = self.game
+        for key in keys:
+            if not game.handle_input(key):
+                return json.dumps({"quit": True})
+        if game.state is not GameState.PLAYING:
+            return self.frame_diff()
+        event = game.step()
+        return self.frame_diff(event)
+
+    def frame_diff(self, event: Optional[TickEvent] = None) -> str:
+        game = self.game
+        cells = [[x, y, GLYPH_CODES[glyph]] for (x, y), glyph in self.renderer.changed_cells(game).items()]
+        return json.dumps({
+            "alive": game.state is GameState.PLAYING,
+            "quit": False,
+            "state": game.state.value,
+            "event": event.value if event else None,
+            "score": game.score,
+            "direction": game.direction.name,
+            "speed": game.game_speed_ms,
+            "head": game.snake[0],
+            "length": len(game.snake),
+            "food": game.food,
+            "cells": cells,
+        }, separators=(',', ':'))
@@ -0,0 +1,75 @@
+from collections import deque
+
+from snake_game.arena import Arena, greedy_bot
+from snake_game.core import Direction, FreeCells, TickEvent
+
+
+def place(arena, bodies, directions, food=()):
+    """Put snakes with the given bodies (head first) and food on the board"""
+    arena.occupied.clear()
+    for snake, body, direction in zip(arena.snakes, bodies, directions):
+        snake.body = deque(body)
+        snake.direction = direction
+        for cell in body:
+            arena.occupied[cell] = snake.index
+    arena.free_cells = FreeCells(arena.width, arena.height, arena.occupied)
+    arena.food.clear()
+    arena.food_slots.clear()
+    for cell in food:
+        arena.food_slots[cell] = len(arena.food)
+        arena.food.append(cell)
+    arena.food_target = len(arena.food)
+
+
+def test_head_on_collisions_kill_both():
+    """Test that heads meeting in one cell or swapping places both die"""
+    arena = Arena(20, 12, snakes=4, food=0, seed=1)
+    place(arena, [[(5, 5)], [(7, 5)], [(5, 8)], [(6, 8)]],
+          [Direction.RIGHT, Direction.LEFT, Direction.RIGHT, Direction.LEFT])
+    assert arena.step() == [TickEvent.DIED] * 4
+    assert arena.alive == 0 and not arena.occupied
+
+
+def test_tails_that_leave_can_be_followed():
+    """Test that a head may take a tail's cell unless that snake is eating"""
+    arena = Arena(20, 12, snakes=3, food=1, seed=1)
+    # Snake 1 chases snake 0's tail; snake 2 runs into its own neck
+    place(arena, [[(5, 5), (4, 5)], [(3, 5), (2, 5)], [(10, 8), (11, 8)]],
+          [Direction.RIGHT, Direction.RIGHT, Direction.UP], food=[(15, 2)])
+    assert arena.step(['.', '.', 'r']) == [TickEvent.MOVE, TickEvent.MOVE, TickEvent.MOVE]
+    assert list(arena.snakes[1].body) == [(4, 5), (3, 5)]
+    
+    # Now snake 0 eats, so its tail stays and snake 1 dies on it
+    place(arena, [[(5, 5), (4, 5)], [(3, 5), (2, 5)]], [Direction.RIGHT, Direction.RIGHT], food=[(6, 5)])
+    arena.snakes[2].alive = False
+    events = arena.step()
+    assert events[:2] == [TickEvent.EAT, TickEvent.DIED]
+    assert list(arena.snakes[0].body) == [(6, 5), (5, 5), (4, 5)] and len(arena.food) == 1
+    assert set(arena.occupied) == {(6, 5), (5, 5), (4, 5)}
+    
+    # Running into another snake's body is fatal
+    place(arena, [[(6, 5), (5, 5), (4, 5)], [(6, 3)]], [Direction.RIGHT, Direction.DOWN])
+    arena.snakes[1].alive = True
+    arena.alive += 1
+    assert arena.step()[:2] == [TickEvent.MOVE, TickEvent.MOVE]
+    assert arena.step()[:2] == [TickEvent.MOVE, TickEvent.DIED]
+
+
+def test_bots_keep_the_board_consistent():
+    """Test that the shared occupancy always matches the live bodies, with food topped up"""
+    arena = Arena(60, 40, snakes=40, food=30, seed=7)
+    bots = [greedy_bot] * 20 + ["rrrruuuullll" * 10] * 10 + [None] * 10
+    eaten = 0
+    for _ in range(150):
+        events = arena.step(arena.moves_for(bots))
+        eaten += events.count(TickEvent.EAT)
+        cells = {cell: snake.index for snake in arena.snakes if snake.alive for cell in snake.body}
+        assert arena.occupied == cells
+        assert sum(len(snake.body) for snake in arena.snakes if snake.alive) == len(cells)
+        assert len(arena.food) == 30 and not set(arena.food) & set(cells)
+        assert arena.alive == sum(snake.alive for snake in arena.snakes)
+    assert eaten > 0 and arena.alive > 0
+    
+    # The same seed and controllers replay identically
+    again = Arena(60, 40, snakes=40, food=30, seed=7)
+    assert again.run(bots, 150) == arena.get_state()
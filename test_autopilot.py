@@ -0,0 +1,41 @@
+import pytest
+
+from snake_game.game import SnakeGame, GameState
+from snake_game.autopilot import Autopilot, cycle_order
+
+
+@pytest.mark.parametrize("width,height", [(2, 2), (3, 4), (4, 3), (6, 6)])
+def test_cycle_visits_every_cell(width, height):
+    """Test that the cycle covers the interior once and every step is to a neighbour"""
+    order = cycle_order(width, height)
+    assert sorted(order) == sorted((x, y) for x in range(1, width + 1) for y in range(1, height + 1))
+    for (x1, y1), (x2, y2) in zip(order, order[1:] + order[:1]):
+        assert abs(x1 - x2) + abs(y1 - y2) == 1
+
+
+def test_odd_boards_are_rejected():
+    """Test that a board with no Hamiltonian cycle is refused"""
+    with pytest.raises(ValueError):
+        Autopilot(7, 7)
+
+
+@pytest.mark.parametrize("width,height", [(4, 4), (6, 5), (8, 10), (12, 12), (13, 14)])
+def test_autopilot_fills_the_board(width, height):
+    """Test that the autopilot wins from any seed, searching once per food at most"""
+    for seed in range(10):
+        autopilot = Autopilot(width, height)
+        game = SnakeGame(width=width, height=height, debug=False, seed=seed, autopilot=autopilot)
+        final = game.simulate()
+        assert final["state"] == GameState.WON.value, f"seed {seed}"
+        assert final["snake_length"] == (width - 2) * (height - 2)
+        assert autopilot.searches <= final["snake_length"]
+
+
+def test_autopilot_reuses_plans_on_a_big_board():
+    """Test that a 200x200 game keeps its A* plans between ticks"""
+    autopilot = Autopilot(200, 200)
+    game = SnakeGame(width=200, height=200, debug=False, seed=1, autopilot=autopilot)
+    final = game.simulate(game.get_next_move() for _ in range(20000))
+    assert final["state"] == GameState.PLAYING.value
+    assert final["snake_length"] > 10
+    assert autopilot.searches <= final["snake_length"] + 1
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from snake_game.game import SnakeGame, GameState, Direction, TickEvent
+from snake_game.batch import BatchEngine, EVENT_MOVE, EVENT_EAT, EVENT_DIED, EVENT_WON
+
+
+EVENT_CODES = {
+    TickEvent.MOVE: EVENT_MOVE,
+    TickEvent.EAT: EVENT_EAT,
+    TickEvent.DIED: EVENT_DIED,
+    TickEvent.WON: EVENT_WON,
+}
+
+STATE_KEYS = ["state", "snake_head", "snake_length", "direction", "food_position", "score", "game_speed_ms"]
+
+
+def choose_move(game, chooser):
+    """Mostly head for the food so snakes grow long enough to fill small boards"""
+    if game.food is None or chooser.random() < 0.02:
+        return chooser.choice("udlr.")
+    head_x, head_y = game.snake[0]
+    food_x, food_y = game.food
+    options = []
+    for move, direction in zip("udlr", [Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT]):
+        x, y = head_x + direction.value[0], head_y + direction.value[1]
+        if 0 < x < game.width - 1 and 0 < y < game.height - 1 and (x, y) not in game.occupied:
+            options.append((abs(x - food_x) + abs(y - food_y) + chooser.random() * 2, move))
+    return min(options)[1] if options else chooser.choice("udlr.")
+
+
+@pytest.mark.parametrize("width,height", [(5, 5), (6, 5), (8, 8), (40, 20)])
+def test_batch_matches_snake_game(width, height):
+    """Test that every game in the batch plays out exactly like SnakeGame with the same seed and moves"""
+    seeds = list(range(24))
+    ticks = 600
+    chooser = random.Random(width * height)
+    
+    all_moves, all_traces = [], []
+    for seed in seeds:
+        game = SnakeGame(width=width, height=height, debug=False, skip_menu=True, seed=seed)
+        moves, trace = [], []
+        for _ in range(ticks):
+            if game.state != GameState.PLAYING:
+                moves.append(".")
+                trace.append(None)
+                continue
+            move = choose_move(game, chooser)
+            event = game.step(move)
+            state = game.get_debug_state()
+            moves.append(move)
+            trace.append(({key: state[key] for key in STATE_KEYS}, EVENT_CODES[event], list(game.snake)))
+        all_moves.append(moves)
+        all_traces.append(trace)
+    
+    engine = BatchEngine(seeds, width=width, height=height)
+    for tick in range(ticks):
+        events = engine.step([moves[tick] for moves in all_moves])
+        for game, trace in enumerate(all_traces):
+            if trace[tick] is None:
+                assert events[game] == 0
+                continue
+            state, event, snake = trace[tick]
+            assert engine.get_state(game) == state, f"game {game} diverged at tick {tick}"
+            assert events[game] == event
+            assert engine.snake(game) == snake
+
+
+def test_batch_accepts_direction_codes():
+    """Test stepping with raw int8 action codes and stopping on the wall"""
+    engine = BatchEngine([1, 2, 3], width=10, height=10)
+    actions = np.array([-1, 0, 1], dtype=np.int8)  # keep going, UP, DOWN
+    
+    for _ in range(3):
+        engine.step(actions)
+    assert [engine.get_state(game)["snake_head"] for game in range(3)] == [(8, 5), (5, 2), (5, 8)]
+    
+    # The start cell is right of and below centre, so going up takes one more tick
+    events = engine.step(actions)
+    assert events[0] == EVENT_DIED and events[1] != EVENT_DIED and events[2] == EVENT_DIED
+    events = engine.step(actions)
+    assert list(events) == [0, EVENT_DIED, 0]
+    assert not engine.running().any()
+    assert list(engine.step(actions)) == [0, 0, 0]
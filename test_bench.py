@@ -0,0 +1,27 @@
+from snake_game.bench import STARTUP_BUDGET_MS, compare, over_budget
+
+
+def test_compare_flags_regressions():
+    """Test that results count as regressions only past the threshold, in the right direction"""
+    baseline = {
+        "rate": {"value": 100.0, "unit": "ticks/s", "higher_is_better": True},
+        "time": {"value": 10.0, "unit": "us", "higher_is_better": False},
+    }
+    results = {
+        "rate": {"value": 85.0, "unit": "ticks/s", "higher_is_better": True},
+        "time": {"value": 8.0, "unit": "us", "higher_is_better": False},
+        "new": {"value": 1.0, "unit": "us", "higher_is_better": False},
+    }
+    assert compare(baseline, results, 20) == []
+    regressions = compare(baseline, results, 10)
+    assert len(regressions) == 1 and regressions[0].startswith("rate:")
+    results["time"]["value"] = 12.0
+    assert len(compare(baseline, results, 10)) == 2
+
+
+def test_startup_budget_is_absolute():
+    """Test that the import time is held to the budget whatever the baseline says"""
+    results = {"startup/import_ms": {"value": 40.0, "unit": "ms", "higher_is_better": False}}
+    assert over_budget(results, STARTUP_BUDGET_MS) is None
+    assert over_budget(results, 30).startswith("startup/import_ms: 40 ms")
+    assert over_budget({}, 30) is None
@@ -0,0 +1,68 @@
+import pytest
+
+from snake_game import clock as clock_module
+from snake_game.clock import TickClock
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 1_000_000_000
+        
+    def monotonic_ns(self):
+        return self.now
+        
+    def advance_ms(self, ms):
+        self.now += int(ms * 1_000_000)
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(clock_module.time, "monotonic_ns", fake.monotonic_ns)
+    return fake
+
+
+def test_ticks_follow_fixed_schedule(fake_time):
+    """Test that a late tick doesn't push later ticks back"""
+    clock = TickClock(100)
+    
+    fake_time.advance_ms(50)
+    assert clock.due_ticks() == 0
+    assert clock.time_until_tick_ms() == 50
+    
+    # First tick runs 30ms late; the next one is still due at 200ms, not 230ms
+    fake_time.advance_ms(80)
+    assert clock.due_ticks() == 1
+    assert clock.time_until_tick_ms() == 70
+    
+    fake_time.advance_ms(70)
+    assert clock.due_ticks() == 1
+    assert clock.ticks == 2
+    assert clock.percentile_ms(50) == 30
+    assert clock.percentile_ms(99) == 30
+
+
+def test_catch_up_then_drop(fake_time):
+    """Test that a short stall is caught up and a long one is dropped"""
+    clock = TickClock(10, max_catch_up=3)
+    
+    fake_time.advance_ms(25)
+    assert clock.due_ticks() == 2
+    assert clock.time_until_tick_ms() == 5
+    
+    fake_time.advance_ms(100)
+    assert clock.due_ticks() == 3
+    assert clock.dropped == 7  # Ticks due at 30..120ms: 10 due, 3 run
+    assert clock.time_until_tick_ms() == 10
+    
+    stats = clock.get_stats()
+    assert stats["ticks"] == 5
+    assert stats["dropped"] == 7
+
+
+def test_interval_change_applies_to_next_tick(fake_time):
+    """Test that speeding up moves the next deadline earlier"""
+    clock = TickClock(150)
+    clock.set_interval(100)
+    assert clock.time_until_tick_ms() == 100
+    assert clock.get_stats()["jitter_p50_ms"] is None
@@ -0,0 +1,55 @@
+import io
+import json
+
+import pytest
+
+from snake_game.debuglog import DebugSink
+from snake_game.game import SnakeGame
+
+
+def test_sink_logs_selected_ticks():
+    """Test that only sampled ticks and chosen events get a line"""
+    game = SnakeGame(width=20, height=12, debug=False, skip_menu=True, seed=1)
+    game.food = (13, 6)
+    stream = io.StringIO()
+    DebugSink(stream, every=4, events=['eat', 'turn', 'died']).attach(game)
+    game.simulate("rrrddll" + "u" * 10)
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(line["tick"], line["event"]) for line in lines] == [
+        (3, "eat"), (4, "turn"), (6, "turn"), (8, "turn"), (12, "move"), (15, "died")]
+    assert lines[0]["snake_length"] == 2 and lines[-1]["state"] == "game_over"
+
+
+def test_no_sink_builds_no_state(monkeypatch):
+    """Test that ticks without a sink, or not selected by it, never build the debug state"""
+    game = SnakeGame(width=20, height=12, debug=False, skip_menu=True, seed=1)
+    calls = []
+    monkeypatch.setattr(game, "get_debug_state", lambda: calls.append(1) or {})
+    for _ in range(5):
+        game.step('.')
+    DebugSink(io.StringIO(), events=['eat']).attach(game)
+    game.step('d')
+    assert calls == []
+
+    with pytest.raises(ValueError):
+        DebugSink(io.StringIO(), events=['jump'])
+
+
+def test_debug_log_is_closed_when_the_game_is_interrupted(monkeypatch, tmp_path):
+    """Test that main() closes the --debug-log file when the game does not finish"""
+    from snake_game import main as main_module
+
+    def interrupted(game):
+        game.step('d')
+        raise KeyboardInterrupt
+
+    sinks = []
+    attach = DebugSink.attach
+    monkeypatch.setattr(DebugSink, "attach", lambda sink, game: sinks.append(sink) or attach(sink, game))
+    monkeypatch.setattr(SnakeGame, "simulate", interrupted)
+    monkeypatch.setattr("sys.argv", ["snake-game", "--headless", "--seed", "1", "--moves", "d",
+                                     "--debug-log", str(tmp_path / "debug.jsonl"), "--debug-events", "turn"])
+    with pytest.raises(KeyboardInterrupt):
+        main_module.main()
+    assert sinks[0].stream.closed
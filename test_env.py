@@ -0,0 +1,76 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from snake_game.game import SnakeGame, GameState
+from snake_game.core import DIRECTION_CODES
+from snake_game.env import VecEnv, SnakeEnv, FEATURES, BODY, HEAD, FOOD
+
+
+def cell_of(grid_plane):
+    return [(int(x), int(y)) for y, x in zip(*np.nonzero(grid_plane))]
+
+
+def test_observation_is_preallocated_and_matches_engine():
+    """Test that step() returns the same buffers, with the body plane being the engine's occupancy grid"""
+    env = VecEnv(8, width=10, height=10)
+    obs, info = env.reset(seed=0)
+    grid, features = obs["grid"], obs["features"]
+    assert grid.shape == (8, 3, 10, 10)
+    assert features.shape == (8, len(FEATURES))
+    assert np.shares_memory(grid, env.engine.occupied)
+
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        obs, reward, terminated, truncated, info = env.step(rng.integers(-1, 4, size=8, dtype=np.int8))
+        assert obs["grid"] is grid and obs["features"] is features
+        for game in range(8):
+            snake = env.engine.snake(game)
+            assert sorted(cell_of(grid[game, BODY])) == sorted(snake)
+            assert cell_of(grid[game, HEAD]) == [snake[0]]
+            food = env.engine.food[game]
+            expected = [] if food < 0 else [(int(food % 10), int(food // 10))]
+            assert cell_of(grid[game, FOOD]) == expected
+            assert features[game, 4] == len(snake) / env.engine.size
+
+
+def test_matches_snake_game_and_auto_resets():
+    """Test that an env plays like SnakeGame with the same seed, then restarts with the next seed"""
+    env = VecEnv(1, width=8, height=8)
+    env.reset(seed=5)
+    game = SnakeGame(width=8, height=8, debug=False, skip_menu=True, seed=5)
+    right = np.array([DIRECTION_CODES[game.direction]], dtype=np.int8)
+
+    total = 0.0
+    while True:
+        expected = game.step()
+        obs, reward, terminated, truncated, info = env.step(right)
+        total += reward[0]
+        if terminated[0]:
+            break
+        assert env.engine.snake(0) == list(game.snake)
+    assert game.state is GameState.GAME_OVER
+    assert reward[0] == -1.0 and total == game.score / 10 - 1
+    assert info["final_score"][0] == game.score
+    # The observation the game finished with survives the restart
+    final = info["final_observation"]
+    assert sorted(cell_of(final["grid"][0, BODY])) == sorted(game.snake)
+    assert final["features"][0, 4] == len(game.snake) / env.engine.size
+
+    # Restarted straight away, with seed 6
+    fresh = SnakeGame(width=8, height=8, debug=False, skip_menu=True, seed=6)
+    assert env.engine.snake(0) == list(fresh.snake)
+    assert env.engine.food[0] == fresh.food[1] * 8 + fresh.food[0]
+    assert info["steps"][0] == 0
+
+
+def test_single_env_truncates():
+    env = SnakeEnv(width=20, height=20, max_steps=3)
+    obs, info = env.reset(seed=0)
+    assert obs["grid"].shape == (3, 20, 20)
+    results = [env.step(-1) for _ in range(3)]
+    assert [truncated for _, _, _, truncated, _ in results] == [False, False, True]
+    assert not any(terminated for _, _, terminated, _, _ in results)
+    info = results[-1][4]
+    assert set(info) == set(env.vec.info)
+    assert np.array_equal(info["final_observation"]["grid"], obs["grid"])
@@ -0,0 +1,37 @@
+from snake_game.game import SnakeGame
+from snake_game.fuzz import random_case, run_case, run_fuzz, shrink, shrink_case
+
+
+def test_random_cases_hold_invariants():
+    """Test a small fuzz run in-process: no failures, and cases are reproducible"""
+    report = run_fuzz(300, seed=7, max_size=12, workers=1, batch_size=100)
+    assert report["cases"] == 300
+    assert report["failures"] == []
+    assert random_case(7, 42, 12) == random_case(7, 42, 12)
+
+
+def test_shrink_finds_minimal_moves():
+    """Test that shrinking keeps only the moves the failure needs"""
+    fails = lambda moves: 'u' in moves and 'l' in moves[moves.index('u'):]
+    assert shrink('r.d.u..rr.dl.u.l', fails) == 'ul'
+
+
+def test_broken_engine_is_caught_and_shrunk(monkeypatch):
+    """Test that food placed on the body is reported with a shorter reproducer"""
+    place_food = SnakeGame.place_food
+
+    def buggy_place_food(self):
+        placed = place_food(self)
+        if self.score >= 10:
+            self.food = self.snake[-1]
+        return placed
+
+    monkeypatch.setattr(SnakeGame, 'place_food', buggy_place_food)
+    report = run_fuzz(200, seed=1, max_size=8, workers=1)
+    assert report["failures"]
+    for failure in report["failures"]:
+        assert failure["problem"].startswith("food (") and failure["problem"].endswith(") is on the body")
+        case = (failure["width"], failure["height"], failure["seed"], failure["moves"])
+        assert run_case(case) == (failure["tick"], failure["problem"])
+        assert len(failure["moves"]) == failure["tick"] <= failure["original_moves"]
+        assert shrink_case(case) == case
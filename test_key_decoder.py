@@ -0,0 +1,82 @@
+import asyncio
+
+from snake_game import clock as clock_module
+from snake_game.clock import TickClock
+from snake_game.game import SnakeGame, Direction, TickEvent
+from snake_game.keys import KeyDecoder
+
+
+def test_burst_of_keys_is_split():
+    """Test that several keys read at once all come through, arrows included"""
+    decoder = KeyDecoder()
+    assert decoder.feed(b'\x1b[Aw\x1b[Dq') == ['\x1b[A', 'w', '\x1b[D', 'q']
+    assert decoder.pending == ''
+
+
+def test_split_escape_sequence_is_held_back():
+    """Test that an arrow key cut across two reads is only returned once complete"""
+    decoder = KeyDecoder()
+    assert decoder.feed(b'a\x1b') == ['a']
+    assert decoder.feed(b'[') == []
+    assert decoder.feed(b'B+') == ['\x1b[B', '+']
+
+
+def test_lone_escape_and_application_mode_arrows():
+    """Test that a lone ESC is flushed on request and SS3 arrows are normalized"""
+    decoder = KeyDecoder()
+    assert decoder.feed(b'\x1b') == []
+    assert decoder.flush() == ['\x1b']
+    assert decoder.feed(b'\x1bOC') == ['\x1b[C']
+    assert decoder.feed(b'\x1bq') == ['\x1b', 'q']
+
+
+def test_multibyte_utf8_split_across_reads():
+    decoder = KeyDecoder()
+    assert decoder.feed('é'.encode()[:1]) == []
+    assert decoder.feed('é'.encode()[1:]) == ['é']
+
+
+def test_play_handles_keys_between_ticks(monkeypatch):
+    """Test the asyncio loop: keys apply as they arrive and ticks keep running until quit"""
+    # The tick schedule runs on a fake clock that only moves one tick at a time, so CI load
+    # can't make play() run catch-up ticks
+    now = [1_000_000_000]
+    monkeypatch.setattr(clock_module.time, "monotonic_ns", lambda: now[0])
+    game = SnakeGame(width=40, height=20, debug=False)
+    game.game_speed_ms = 10
+    frames = []
+    
+    async def next_frame():
+        count = len(frames)
+        now[0] += 10_000_000
+        while len(frames) == count:
+            await asyncio.sleep(0.001)
+    
+    async def session():
+        keys = asyncio.Queue()
+        task = asyncio.ensure_future(game.play(keys, lambda: frames.append(game.snake[0]), TickClock(10)))
+        while not frames:
+            await asyncio.sleep(0.001)
+        await next_frame()
+        await next_frame()
+        keys.put_nowait('\x1b[A')
+        await next_frame()
+        await next_frame()
+        keys.put_nowait('q')
+        return await task
+    
+    assert asyncio.run(session()) is None
+    assert game.direction == Direction.UP
+    assert frames == [(20, 10), (21, 10), (22, 10), (22, 9), (22, 8)]
+    assert game.clock.ticks == len(frames) - 1
+
+
+def test_play_returns_when_snake_dies():
+    game = SnakeGame(width=10, height=6, debug=False)
+    game.game_speed_ms = 5
+    game.food = (1, 1)
+    
+    async def session():
+        return await game.play(asyncio.Queue(), lambda: None)
+    
+    assert asyncio.run(session()) is TickEvent.DIED
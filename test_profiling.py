@@ -0,0 +1,40 @@
+import io
+from contextlib import redirect_stdout
+
+from snake_game.game import SnakeGame
+from snake_game.profiling import PhaseHistogram
+
+
+def test_profiling_is_off_by_default():
+    """Test that games without profiling keep their plain methods"""
+    game = SnakeGame(width=20, height=12, debug=False, skip_menu=True, seed=1)
+    assert game.profiler is None and "move_snake" not in vars(game)
+    assert game.get_debug_state()["phase_stats"] is None
+
+
+def test_profiled_phases_are_counted():
+    """Test that every timed phase call lands in its histogram"""
+    game = SnakeGame(width=20, height=12, debug=False, skip_menu=True, seed=1, profile=True)
+    result = game.simulate("rrrdddlll")
+    assert result["phase_stats"]["move_snake"]["count"] == 9
+    assert result["phase_stats"]["render_game"]["count"] == 0
+
+    with redirect_stdout(io.StringIO()):
+        game.render_game()
+    assert game.handle_input('w')
+    stats = game.get_debug_state()["phase_stats"]
+    assert stats["render_game"]["count"] == 1 and stats["handle_input"]["count"] == 1
+    assert stats["move_snake"]["max_us"] >= stats["move_snake"]["p50_us"] > 0
+    assert "move_snake" in game.profiler.summary()
+
+
+def test_histogram_percentiles():
+    """Test that percentiles fall in the power-of-two bucket of the true value"""
+    histogram = PhaseHistogram()
+    for elapsed_ns in [1000] * 98 + [50_000, 3_000_000]:
+        histogram.add(elapsed_ns)
+    stats = histogram.get_stats()
+    assert stats["count"] == 100 and stats["max_us"] == 3000
+    assert 1 <= stats["p50_us"] < 2.1
+    assert 50 <= stats["p99_us"] < 66
+    assert PhaseHistogram().get_stats()["p99_us"] is None
@@ -0,0 +1,239 @@
+import random
+import re
+
+from snake_game.game import SnakeGame
+from snake_game.render import BODY, EMPTY, FOOD, HEAD, FrameRenderer, static_rows
+
+
+ESCAPE = re.compile(r'\x1b\[([0-9;]*)([A-Za-z])')
+
+
+class Screen:
+    """Just enough of a terminal to replay FrameRenderer output"""
+    
+    def __init__(self):
+        self.cells = {}
+        self.row, self.col = 1, 1
+        
+    def feed(self, data):
+        pos = 0
+        while pos < len(data):
+            match = ESCAPE.match(data, pos)
+            if match:
+                args, command = match.groups()
+                if command == 'H':
+                    row, col = (args.split(';') + ['1'])[:2] if args else ('1', '1')
+                    self.row, self.col = int(row or 1), int(col or 1)
+                elif command == 'C':
+                    self.col += int(args or 1)
+                elif command == 'J':
+                    if args == '2':
+                        self.cells.clear()
+                    else:
+                        for key in [key for key in self.cells if key >= (self.row, self.col)]:
+                            del self.cells[key]
+                elif command == 'K':
+                    for key in [key for key in self.cells if key[0] == self.row and key[1] >= self.col]:
+                        del self.cells[key]
+                pos = match.end()
+                continue
+            char = data[pos]
+            pos += 1
+            if char == '\n':
+                self.row, self.col = self.row + 1, 1
+                continue
+            self.cells[(self.row, self.col)] = char
+            if ord(char) >= 0x1F000:
+                self.cells.pop((self.row, self.col + 1), None)
+                self.col += 2
+            else:
+                self.col += 1
+                
+    def text(self):
+        return {key: value for key, value in self.cells.items() if value != ' '}
+
+
+def test_diff_frames_match_full_redraw():
+    """Test that a screen updated with diffs looks the same as a freshly drawn one"""
+    random.seed(3)
+    game = SnakeGame(width=16, height=12, debug=False, seed=3)
+    screen = Screen()
+    screen.feed(game.renderer.render(game))
+    
+    for tick in range(300):
+        head_x, head_y = game.snake[0]
+        if tick % 4 == 0:
+            game.food = (head_x + game.direction.value[0], head_y + game.direction.value[1])
+        if not game.step(random.choice("udlr..")) or game.state.value != "playing":
+            break
+        screen.feed(game.renderer.render(game))
+        
+        fresh = Screen()
+        fresh.feed(FrameRenderer(game.width, game.height).render(game))
+        assert screen.text() == fresh.text(), f"screen differs at tick {tick}"
+        assert (screen.row, screen.col) == (fresh.row, fresh.col)
+
+
+def test_diff_frame_only_sends_changed_cells():
+    """Test that a plain move redraws just the old tail, the old head and the new head"""
+    game = SnakeGame(width=40, height=20, debug=False)
+    game.food = (1, 1)
+    renderer = game.renderer
+    full = renderer.render(game)
+    
+    for _ in range(3):
+        head_x, head_y = game.snake[0]
+        game.food = (head_x + 1, head_y)
+        game.move_snake()
+    game.food = (1, 1)
+    renderer.render(game)
+    
+    game.move_snake()
+    frame = renderer.render(game)
+    # Old tail cleared, then old head turned into body and the new head next to it in one run
+    cell_updates = re.findall(r'\x1b\[\d+;\d+H([^\x1b]+)', frame)
+    assert cell_updates == ['  ', '🟢🐍']
+    assert len(frame) < len(full) // 20
+
+
+def test_static_rows_are_cached_and_batched():
+    """Test that the border layer is built once per size with one color span per border run"""
+    assert static_rows(80, 40) is static_rows(80, 40)
+    rows = static_rows(80, 40)
+    assert len(rows) == 40
+    assert rows[0].count('\x1b[96m') == 1
+    assert rows[1].count('\x1b[96m') == 2
+
+
+def test_frame_byte_count_reported():
+    """Test that frame sizes are reported and a full 80x40 frame is far smaller than per-cell colors"""
+    game = SnakeGame(width=80, height=40, debug=False)
+    frame = game.renderer.render(game)
+    assert game.get_debug_state()["frame_bytes"] == len(frame.encode('utf-8'))
+    # Drawing every cell with its own border color used to take over 10KB
+    assert game.renderer.last_frame_bytes < 4000
+    
+    game.move_snake()
+    game.renderer.render(game)
+    assert game.get_debug_state()["frame_bytes"] < 100
+
+
+def test_viewport_follows_head():
+    """Test that a board bigger than the view scrolls with the head and diffs stay correct"""
+    random.seed(5)
+    game = SnakeGame(width=60, height=40, debug=False, skip_menu=True, seed=5)
+    renderer = game.renderer
+    renderer.set_view(20, 10)
+    screen = Screen()
+    screen.feed(renderer.render(game))
+    assert renderer.visible(game.snake[0])
+    
+    scrolls = 0
+    for tick in range(400):
+        head_x, head_y = game.snake[0]
+        # Wander, keeping away from the walls
+        move = random.choice("udlr" + "..." * 3)
+        if head_x < 4 or head_x > 55 or head_y < 4 or head_y > 35:
+            move = "r" if head_x < 30 else "l"
+            move = move if 4 <= head_y <= 35 else ("d" if head_y < 20 else "u")
+        view = (renderer.left, renderer.top)
+        if game.step(move).value in ("died", "won"):
+            break
+        screen.feed(renderer.render(game))
+        scrolls += (renderer.left, renderer.top) != view
+        assert renderer.visible(game.snake[0])
+        
+        fresh_renderer = FrameRenderer(game.width, game.height)
+        fresh_renderer.set_view(20, 10)
+        fresh_renderer.left, fresh_renderer.top = renderer.left, renderer.top
+        fresh = Screen()
+        fresh.feed(fresh_renderer.render(game))
+        assert screen.text() == fresh.text(), f"screen differs at tick {tick}"
+        # Nothing on the board rows is drawn past the 20 cell (40 column) view
+        board_rows = range(FrameRenderer.GRID_TOP, FrameRenderer.GRID_TOP + 10)
+        assert max(col for row, col in screen.cells if row in board_rows) <= 40
+    assert scrolls > 2
+
+
+def test_huge_board_is_sparse():
+    """Test that a 10000x10000 board costs memory for the snake, not the area"""
+    import tracemalloc
+    
+    tracemalloc.start()
+    try:
+        game = SnakeGame(width=10000, height=10000, debug=False, skip_menu=True, seed=1)
+        game.renderer.fit_terminal((80, 24))
+        for tick in range(200):
+            game.step("d" if tick % 50 == 49 else ".")
+            game.renderer.render(game)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 1_000_000
+    assert game.renderer.columns == 40 and game.renderer.rows == 17
+
+
+def test_piped_output_shows_whole_board(capsys):
+    """Test that render_game only fits the view to a real terminal"""
+    game = SnakeGame(width=200, height=100, debug=False, skip_menu=True, seed=1)
+    game.render_game()
+    assert (game.renderer.columns, game.renderer.rows) == (200, 100)
+    assert capsys.readouterr().out
+
+
+def test_debug_state_fits_under_the_board():
+    """Test that the --debug block is part of the frame and never pushes the board off the terminal"""
+    random.seed(7)
+    game = SnakeGame(width=30, height=30, debug=True, skip_menu=True, seed=7)
+    renderer = game.renderer
+    terminal = (80, 40)
+    screen = Screen()
+    for tick in range(100):
+        game.print_debug_state()
+        renderer.fit_terminal(terminal)
+        screen.feed(renderer.render(game))
+        assert max(row for row, _ in screen.cells) <= terminal[1], f"scrolled at tick {tick}"
+        
+        fresh_renderer = FrameRenderer(game.width, game.height)
+        fresh_renderer.set_footer(renderer.footer)
+        fresh_renderer.fit_terminal(terminal)
+        fresh_renderer.left, fresh_renderer.top = renderer.left, renderer.top
+        fresh = Screen()
+        fresh.feed(fresh_renderer.render(game))
+        assert screen.text() == fresh.text(), f"screen differs at tick {tick}"
+        game.step(random.choice("udlr" + "..." * 3))
+        if game.state.value != "playing":
+            break
+    assert tick > 20 and renderer.rows < game.height and renderer.footer_lines > 20
+
+
+def test_changed_cells_only_scans_after_jumps(monkeypatch):
+    """Test that one-tick frames are diffed from head/tail/food alone and still match the game"""
+    chooser = random.Random(3)
+    game = SnakeGame(width=30, height=20, debug=False, skip_menu=True, seed=3)
+    renderer = game.renderer
+    scans = []
+    scan_cells = renderer.scan_cells
+    monkeypatch.setattr(renderer, "scan_cells", lambda game: scans.append(1) or scan_cells(game))
+    board = dict(renderer.changed_cells(game))
+    jumps = 0
+    for frame in range(300):
+        ticks = 3 if frame % 50 == 25 else 1  # Now and then several catch-up ticks in one frame
+        jumps += ticks > 1
+        for _ in range(ticks):
+            head_x, head_y = game.snake[0]
+            food_x, food_y = game.food
+            move = chooser.choice("udlr") if chooser.random() < 0.1 else (
+                ("r" if food_x > head_x else "l") if food_x != head_x else ("d" if food_y > head_y else "u"))
+            event = game.step(move)
+        if event.value in ("died", "won"):
+            break
+        board.update(renderer.changed_cells(game))
+        expected = {cell: "body" for cell in game.snake}
+        expected[game.snake[0]] = "head"
+        expected[game.food] = "food"
+        glyphs = {"body": BODY, "head": HEAD, "food": FOOD}
+        assert {cell: glyph for cell, glyph in board.items() if glyph != EMPTY} == \
+            {cell: glyphs[kind] for cell, kind in expected.items()}, f"board differs at frame {frame}"
+    assert len(game.snake) > 5
+    assert len(scans) <= 1 + jumps
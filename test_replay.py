@@ -0,0 +1,110 @@
+import io
+
+from snake_game.autopilot import Autopilot
+from snake_game.game import SnakeGame, GameState, TickEvent
+from snake_game.replay import ReplayReader, ReplayWriter, record_moves
+
+
+def follow_cycle(game):
+    """Follow a Hamiltonian cycle of the interior (even number of rows), which fills the board"""
+    x, y = game.snake[0]
+    inner_width, inner_height = game.width - 2, game.height - 2
+    if x == 1:
+        target = (2, 1) if y == 1 else (1, y - 1)
+    elif y % 2 == 1:
+        target = (x + 1, y) if x < inner_width else (x, y + 1)
+    elif x > 2:
+        target = (x - 1, y)
+    else:
+        target = (1, y) if y == inner_height else (x, y + 1)
+    return {(0, -1): "u", (0, 1): "d", (-1, 0): "l", (1, 0): "r"}[(target[0] - x, target[1] - y)]
+
+
+def record_game(width, height, ticks, keyframe_interval, seed=11):
+    """Play and record a game, keeping the state after every tick"""
+    game = SnakeGame(width=width, height=height, debug=False, skip_menu=True, seed=seed)
+    stream = io.BytesIO()
+    writer = ReplayWriter(stream, game, keyframe_interval=keyframe_interval)
+    states = [game.get_debug_state()]
+    event = None
+    for _ in range(ticks):
+        event = game.step(follow_cycle(game))
+        writer.record(game)
+        states.append(game.get_debug_state())
+        if event is TickEvent.DIED or event is TickEvent.WON:
+            break
+    writer.close(event)
+    stream.seek(0)
+    return stream, states, event
+
+
+def test_replay_plays_back_every_tick():
+    """Test that streaming playback reproduces the recorded game tick for tick"""
+    stream, states, event = record_game(8, 10, 5000, keyframe_interval=64)
+    reader = ReplayReader(stream)
+    
+    played = [game.get_debug_state() for game in reader.frames(1)]
+    assert len(played) == len(states) - 1
+    for tick, state in enumerate(played, start=1):
+        assert state["snake_head"] == states[tick]["snake_head"]
+        assert state["food_position"] == states[tick]["food_position"]
+        assert state["score"] == states[tick]["score"]
+    assert reader.total_ticks == len(states) - 1
+    assert reader.final_event is event is TickEvent.WON
+
+
+def test_replay_seeks_through_keyframes():
+    """Test jumping straight to ticks on both sides of keyframes, including past half full"""
+    stream, states, _ = record_game(8, 10, 5000, keyframe_interval=32)
+    reader = ReplayReader(stream)
+    assert len(reader.index()) > 10
+    
+    for tick in [0, 1, 31, 32, 33, 64, len(states) // 2, len(states) - 40, len(states) - 1]:
+        state = reader.game_at(tick).get_debug_state()
+        assert state["snake_head"] == states[tick]["snake_head"], f"tick {tick}"
+        assert state["snake_length"] == states[tick]["snake_length"]
+        assert state["food_position"] == states[tick]["food_position"]
+
+
+def test_replay_is_compact():
+    """Test that ticks cost 2 bits each between keyframes"""
+    game = SnakeGame(width=200, height=200, debug=False)
+    stream = io.BytesIO()
+    final = record_moves(stream, game, "rdlu" * 2000, keyframe_interval=100000)
+    assert final["state"] == GameState.PLAYING.value
+    
+    # Header, starting keyframe for the unseeded game, 8000 ticks in 2000 bytes, end block
+    assert len(stream.getvalue()) - 2000 < 100
+    stream.seek(0)
+    assert ReplayReader(stream).game_at(8000).snake[0] == game.snake[0]
+
+
+def test_unseeded_replay_restores_rng():
+    """Test that a game without a seed replays from its starting keyframe"""
+    stream, states, _ = record_game(8, 10, 300, keyframe_interval=4096, seed=None)
+    reader = ReplayReader(stream)
+    assert reader.seed is None
+    assert reader.game_at(len(states) - 1).get_debug_state()["rng_state"] == states[-1]["rng_state"]
+
+
+def test_frames_start_at_tick_zero_with_or_without_seed():
+    """Test that seeded and unseeded replays both yield the game before its first tick first"""
+    for seed in (11, None):
+        stream, states, _ = record_game(8, 10, 50, keyframe_interval=16, seed=seed)
+        heads = [game.snake[0] for game in ReplayReader(stream).frames()]
+        assert heads == [state["snake_head"] for state in states], f"seed {seed}"
+
+
+def test_large_seeds_and_autopilot_runs_record():
+    """Test that any seed GameRandom accepts fits the header, and record_moves() plays the autopilot"""
+    seed = 2**64 - 5
+    game = SnakeGame(width=6, height=6, debug=False, seed=seed, autopilot=Autopilot(6, 6))
+    stream = io.BytesIO()
+    final = record_moves(stream, game)
+    assert final["state"] == GameState.WON.value
+    stream.seek(0)
+    reader = ReplayReader(stream)
+    assert reader.seed == seed
+    reader.index()
+    assert reader.total_ticks > 0 and reader.final_event is TickEvent.WON
+    assert list(reader.game_at(reader.total_ticks).snake) == list(game.snake)
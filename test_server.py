@@ -0,0 +1,85 @@
+import asyncio
+
+from snake_game.server import GameServer
+
+
+async def read_until(reader, text, timeout=2):
+    data = b''
+    while text.encode() not in data:
+        data += await asyncio.wait_for(reader.read(65536), timeout)
+    return data
+
+
+def test_session_plays_and_quits():
+    """Test a client starting a game, receiving diff frames and quitting"""
+    async def scenario():
+        game_server = GameServer(width=20, height=10)
+        server = await game_server.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        
+        await read_until(reader, 'Press any key')
+        writer.write(b' ')
+        frame = await read_until(reader, 'Current speed')
+        assert b'\r\n' in frame
+        assert game_server.playing() == 1
+        
+        # Turning down produces small cursor-addressed updates, not full frames
+        writer.write(b'\x1b[B')
+        update = await asyncio.wait_for(reader.read(65536), 1)
+        assert b'\x1b[2J' not in update
+        
+        writer.write(b'q')
+        assert await asyncio.wait_for(reader.read(), 2) is not None
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        await asyncio.sleep(0)
+        return game_server
+    
+    game_server = asyncio.run(scenario())
+    assert not game_server.sessions
+
+
+def test_many_concurrent_sessions():
+    """Test that one event loop runs many games on their own schedules"""
+    async def scenario():
+        game_server = GameServer(width=12, height=8)
+        server = await game_server.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        clients = [await asyncio.open_connection('127.0.0.1', port) for _ in range(50)]
+        for _, writer in clients:
+            writer.write(b' ')  # Start; with no turns the snake runs into the right wall
+        
+        # Every snake dies within a few ticks and the session offers a restart
+        for reader, _ in clients:
+            await read_until(reader, 'play again', timeout=5)
+        assert len(game_server.sessions) == 50
+        assert game_server.playing() == 0
+        
+        for _, writer in clients:
+            writer.close()
+        await asyncio.sleep(0.1)
+        remaining = len(game_server.sessions)
+        server.close()
+        await server.wait_closed()
+        return remaining
+    
+    assert asyncio.run(scenario()) == 0
+
+
+def test_server_full():
+    async def scenario():
+        game_server = GameServer(max_sessions=1)
+        server = await game_server.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        first = await asyncio.open_connection('127.0.0.1', port)
+        await read_until(first[0], 'Press any key')
+        second_reader, _ = await asyncio.open_connection('127.0.0.1', port)
+        data = await read_until(second_reader, 'Server full')
+        first[1].close()
+        server.close()
+        await server.wait_closed()
+        return data
+    
+    assert b'Server full' in asyncio.run(scenario())
@@ -1,6 +1,7 @@
 import pytest
 import json
-from snake_game.game import SnakeGame, Direction, GameState
+import random
+from snake_game.game import SnakeGame, Direction, GameState, TickEvent
 
 
 def test_move_sequence_returns_to_start():
@@ -168,5 +169,155 @@ def test_automated_vs_manual_mode():
     assert len(auto_game.moves) == 3
 
 
+def test_occupancy_index_tracks_body():
+    """Test that the occupancy set stays in sync with the body as the snake moves and grows"""
+    game = SnakeGame(width=40, height=20, debug=False)
+    
+    for _ in range(3):
+        # Put food directly in front of the head so the snake grows
+        head_x, head_y = game.snake[0]
+        game.food = (head_x + 1, head_y)
+        assert game.move_snake()
+        assert game.occupied == set(game.snake)
+    
+    assert len(game.snake) == 4
+    assert game.score == 30
+    
+    # Moving without eating keeps the length and drops the old tail
+    game.food = (1, 1)
+    tail = game.snake[-1]
+    assert game.move_snake()
+    assert len(game.snake) == 4
+    assert tail not in game.occupied
+    assert game.occupied == set(game.snake)
+
+
+def test_snake_view_acts_like_a_list():
+    """Test that game.snake still slices and compares like the list it used to be"""
+    game = SnakeGame(width=20, height=12, debug=False, skip_menu=True, seed=1)
+    start = game.snake[0]
+    assert game.snake == [start] and [start] == game.snake
+    game.food = (start[0] + 1, start[1])
+    game.step()
+    game.step()
+    body = [(start[0] + 2, start[1]), (start[0] + 1, start[1])]
+    assert game.snake == body and game.snake != body[:1]
+    assert game.snake[1:] == body[1:] and game.snake[::-1] == body[::-1]
+    assert game.snake[-1] == body[-1] and list(reversed(game.snake)) == body[::-1]
+    assert body[0] in game.snake and len(game.snake) == 2
+    with pytest.raises(AttributeError):
+        game.snake.append((1, 1))
+
+
+def test_food_placement_on_nearly_full_board():
+    """Test that food always lands on a free cell, and a full board is a win"""
+    # 3x2 interior: the snake snakes through every cell, eating as it goes
+    game = SnakeGame(width=5, height=4, debug=False)
+    path = [Direction.LEFT, Direction.DOWN, Direction.RIGHT, Direction.RIGHT, Direction.UP]
+    game.snake = [(2, 1)]
+    game.occupied.clear()
+    game.occupied.add((2, 1))
+    
+    for direction in path:
+        head_x, head_y = game.snake[0]
+        dx, dy = direction.value
+        game.food = (head_x + dx, head_y + dy)
+        game.direction = direction
+        assert game.move_snake()
+        assert game.occupied == set(game.snake)
+        if game.food is not None:
+            assert game.food not in game.occupied
+            assert len(game.free_cells) == 6 - len(game.snake)
+    
+    assert len(game.snake) == 6
+    assert game.food is None
+    assert game.state == GameState.WON
+
+
+def test_simulate_matches_run():
+    """Test that the headless simulate() ends in the same state as an automated run()"""
+    moves = "..8..4..5655"
+    
+    run_game = SnakeGame(width=40, height=20, debug=False, moves=list(moves))
+    run_game.run()
+    
+    sim_game = SnakeGame(width=40, height=20, debug=False, moves=list(moves))
+    result = sim_game.simulate()
+    
+    assert result["ticks"] == len(moves)
+    assert result["snake_head"] == run_game.get_debug_state()["snake_head"]
+    assert result["direction"] == run_game.get_debug_state()["direction"]
+    assert result["move_index"] == len(moves)
+
+
+def test_simulate_records_events_and_stops_on_death():
+    """Test per-tick events and that simulation stops when the snake dies"""
+    game = SnakeGame(width=10, height=10, debug=False)
+    result = game.simulate("rrrrrrrr", record_events=True)
+    
+    # Start at (5, 5): the head reaches x=8 after 3 ticks and hits the wall on the 4th
+    assert result["ticks"] == 4
+    assert result["state"] == "game_over"
+    events = result["events"]
+    assert all(event in (TickEvent.MOVE, TickEvent.EAT) for _, _, event, _ in events[:3])
+    assert events[-1][2] == TickEvent.DIED
+    assert events[2][3] == (8, 5)
+
+
+def test_finished_games_stay_finished():
+    """Test that stepping or simulating a game that is over changes nothing"""
+    game = SnakeGame(width=10, height=10, debug=False)
+    assert game.simulate("rrrr")["state"] == "game_over"
+    head = game.snake[0]
+    assert game.step('u') is None
+    assert game.snake[0] == head and game.state is GameState.GAME_OVER
+    
+    result = game.simulate("uuuu")
+    assert result["ticks"] == 0 and result["state"] == "game_over"
+    assert game.snake[0] == head
+
+
+def test_seeded_games_are_reproducible():
+    """Test that a seed fixes food placement regardless of the global random module"""
+    moves = list("rrrrddddllllluuuuu" * 20)
+    games = []
+    for noise in range(2):
+        random.seed(noise)
+        games.append(SnakeGame(width=12, height=12, debug=False, moves=moves, seed=42).simulate(record_events=True))
+    assert games[0] == games[1]
+    assert games[0]["seed"] == 42
+    
+    # Restoring the RNG state continues the same sequence of food cells
+    game = SnakeGame(width=12, height=12, debug=False, seed=42)
+    state = game.get_debug_state()["rng_state"]
+    draws = [game.free_cells.sample(game.rng) for _ in range(5)]
+    game.rng.setstate(state)
+    assert [game.free_cells.sample(game.rng) for _ in range(5)] == draws
+
+
+def test_quick_turns_apply_one_per_tick():
+    """Test that keys pressed within one tick are all played, one turn per tick"""
+    game = SnakeGame(width=20, height=12, debug=False, skip_menu=True, seed=1)
+    game.food = (1, 1)
+    start_x, start_y = game.snake[0]
+    
+    # Up then left before the next tick: a U-turn taken over two ticks
+    game.handle_input('\x1b[A')
+    game.handle_input('\x1b[D')
+    assert game.direction == Direction.RIGHT
+    game.step()
+    assert game.direction == Direction.UP and game.snake[0] == (start_x, start_y - 1)
+    game.step()
+    assert game.direction == Direction.LEFT and game.snake[0] == (start_x - 1, start_y - 1)
+    
+    # Reversal is checked against the last queued turn, and the queue is bounded
+    game.handle_input('d')  # Right, opposite of left: ignored
+    game.handle_input('s')
+    game.handle_input('d')
+    game.handle_input('w')
+    game.handle_input('a')
+    assert list(game.turns) == [Direction.DOWN, Direction.RIGHT, Direction.UP]
+
+
 if __name__ == "__main__":
-    pytest.main([__file__])
\ No newline at end of file
+    pytest.main([__file__])
@@ -0,0 +1,88 @@
+import random
+
+from snake_game.game import SnakeGame, Direction, GameState, TickEvent, MOVE_DIRECTIONS
+from snake_game.snapshot import GameSnapshot
+
+
+def test_apply_matches_step():
+    """Test that applying moves to snapshots follows the game tick for tick"""
+    chooser = random.Random(1)
+    for seed in range(20):
+        game = SnakeGame(width=10, height=8, debug=False, skip_menu=True, seed=seed)
+        snapshot = GameSnapshot.from_game(game)
+        while game.state == GameState.PLAYING and len(game.snake) * 2 < 48:
+            move = chooser.choice("udlr")
+            if game.food and chooser.random() < 0.7:
+                # Head for the food so the snake grows
+                dx, dy = game.food[0] - game.snake[0][0], game.food[1] - game.snake[0][1]
+                move = ("r" if dx > 0 else "l") if dx else ("d" if dy > 0 else "u")
+            event = game.step(move)
+            snapshot = snapshot.apply(MOVE_DIRECTIONS[move])
+            assert snapshot.event is event
+            assert snapshot == GameSnapshot.from_game(game)
+            assert list(snapshot.body()) == list(game.snake)
+            assert snapshot.score == game.score and snapshot.game_speed_ms == game.game_speed_ms
+
+
+def test_snapshots_are_values():
+    """Test that equal states hash alike wherever they came from, and branching leaves the parent alone"""
+    game = SnakeGame(width=20, height=20, debug=False, skip_menu=True, seed=3)
+    game.food = (1, 1)
+    start = GameSnapshot.from_game(game)
+
+    first = start.apply(Direction.RIGHT).apply(Direction.DOWN).apply(Direction.RIGHT)
+    second = start.apply(Direction.DOWN).apply(Direction.RIGHT).apply(Direction.RIGHT)
+    assert first == second and first is not second
+    assert len({first, second, start}) == 2
+    assert start.clone() is start
+    assert start.head == (10, 10) and start.state is GameState.PLAYING
+
+    # Opposite turns are ignored, and finished games stay finished
+    assert start.apply(Direction.LEFT) == start.apply(Direction.RIGHT)
+    dead = start
+    for _ in range(10):
+        dead = dead.apply(Direction.UP)
+    assert dead.state is GameState.GAME_OVER and dead.event is TickEvent.DIED
+    assert dead.apply(Direction.DOWN) is dead
+
+
+def test_restore_continues_the_game():
+    """Test that a restored game carries on exactly like a snapshot"""
+    game = SnakeGame(width=12, height=12, debug=False, skip_menu=True, seed=8)
+    game.food = (7, 6)
+    game.simulate("rrdlldrr")
+    snapshot = GameSnapshot.from_game(game)
+
+    other = SnakeGame(width=12, height=12, debug=False, skip_menu=True)
+    snapshot.restore(other)
+    assert list(other.snake) == list(game.snake) and len(game.snake) == 2
+    assert other.rng.getstate() == game.rng.getstate() and other.food == game.food
+    assert not snapshot.is_blocked((1, 1)) and snapshot.is_blocked(game.snake[1]) and snapshot.is_blocked((0, 5))
+    for move in "uuullldd":
+        snapshot = snapshot.apply(MOVE_DIRECTIONS[move])
+        other.step(move)
+        assert snapshot == GameSnapshot.from_game(other) and snapshot.state is GameState.PLAYING
+
+
+def test_apply_shares_structure_and_wraps_the_ring():
+    """Test that apply() only copies the changed trie paths, and long games wrap the segment ring"""
+    from snake_game.bench import lay_snake
+
+    game = SnakeGame(width=10, height=10, debug=False, skip_menu=True, seed=2)
+    steps = lay_snake(game, 20)
+    game.direction = steps[18]
+    snapshot = GameSnapshot.from_game(game)
+    for tick in range(3000):  # The ring holds 2048 segments on this board
+        direction = steps[(19 + tick) % len(steps)]
+        game.step(direction.name[0].lower())
+        parent, snapshot = snapshot, snapshot.apply(direction)
+        if tick % 250 == 0:
+            assert snapshot == GameSnapshot.from_game(game)
+            assert list(snapshot.body()) == list(game.snake)
+    assert snapshot.state is GameState.PLAYING and snapshot.length == 20
+
+    big = SnakeGame(width=402, height=402, debug=False, skip_menu=True, seed=2)
+    start = GameSnapshot.from_game(big)
+    after = start.apply(Direction.RIGHT)
+    shared = sum(a is b for a, b in zip(start.occupied, after.occupied))
+    assert shared == len(start.occupied) - 1
@@ -0,0 +1,18 @@
+from snake_game.bench import INTERACTIVE_MODULES, import_times
+
+# Only which modules load is checked here; the startup time budget is enforced by
+# `snake-game bench --startup-budget-ms`, outside the unit tests
+
+
+def test_scripted_entry_point_skips_terminal_stack():
+    """Test that importing the entry point loads neither the interactive modules nor numpy"""
+    times = import_times('snake_game.main')
+    assert 'snake_game.core' in times and 'snake_game.game' in times
+    assert not [module for module in times if module.split('.')[0] in INTERACTIVE_MODULES]
+    assert 'snake_game.keys' not in times
+
+
+def test_core_needs_no_game_module():
+    """Test that the shared rules import on their own"""
+    times = import_times('snake_game.core')
+    assert 'snake_game.core' in times and 'snake_game.render' not in times
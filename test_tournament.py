@@ -0,0 +1,50 @@
+import csv
+import json
+
+from snake_game.game import SnakeGame
+from snake_game.tournament import run_tournament, summarize, parse_seeds, main
+
+
+def test_tournament_matches_simulate():
+    """Test that pooled results match playing each script directly"""
+    scripts = ["6845", "..8..4..5655", "rrrrrrrrrrrrrrrrrrrrrrrr"]
+    results = run_tournament(scripts, seeds=[1, 2], width=40, height=20, workers=2)
+    
+    assert [(result["script"], result["seed"]) for result in results] == [(0, 1), (0, 2), (1, 1), (1, 2), (2, 1), (2, 2)]
+    for result in results:
+        expected = SnakeGame(width=40, height=20, debug=False, moves=list(scripts[result["script"]])).simulate()
+        assert result["ticks"] == expected["ticks"]
+        assert result["state"] == expected["state"]
+    
+    # Running right from x=20 hits the wall on the 19th move
+    assert results[-1]["state"] == "game_over"
+    assert results[-1]["ticks"] == 19
+
+
+def test_same_seed_gives_same_result():
+    """Test that seeded games are reproducible across workers"""
+    scripts = ["ruldruldrrrdddllluuu" * 5] * 4
+    results = run_tournament(scripts, seeds=[7], width=12, height=12, workers=2)
+    assert len({(result["score"], result["ticks"]) for result in results}) == 1
+
+
+def test_summary_and_outputs(tmp_path):
+    """Test aggregation and the JSON/CSV writers"""
+    scripts_file = tmp_path / "scripts.txt"
+    scripts_file.write_text("# two scripts\n6845\n\nrrrr\n")
+    json_path = tmp_path / "results.json"
+    csv_path = tmp_path / "games.csv"
+    
+    main([str(scripts_file), "--seeds", "3", "-j", "1", "--json", str(json_path), "--csv", str(csv_path)])
+    
+    data = json.loads(json_path.read_text())
+    assert data["summary"]["games"] == 6
+    assert data["summary"]["ticks"]["max"] == 4
+    with open(csv_path, newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert len(rows) == 6
+    assert {row["seed"] for row in rows} == {"0", "1", "2"}
+    
+    assert parse_seeds("5:8") == [5, 6, 7]
+    assert parse_seeds("1,7") == [1, 7]
+    assert summarize([])["games"] == 0
@@ -0,0 +1,96 @@
+import json
+import random
+import re
+from pathlib import Path
+
+from snake_game.bench import import_times
+from snake_game.game import SnakeGame
+from snake_game.web import WebGame
+
+WEB_PAGE = Path(__file__).with_name("snake_web.html")
+
+
+def test_tick_diffs_rebuild_the_board():
+    """Test that patching a grid with each tick's diff always matches the game"""
+    chooser = random.Random(4)
+    web = WebGame(seed=4)
+    game = web.game
+    board = {}
+    
+    def apply(diff):
+        for x, y, glyph in diff["cells"]:
+            board[(x, y)] = glyph
+        expected = {cell: 'b' for cell in game.snake}
+        expected[game.snake[0]] = 'h'
+        expected[game.food] = 'f'
+        assert {cell: glyph for cell, glyph in board.items() if glyph != ' '} == expected
+    
+    apply(json.loads(web.start()))
+    for _ in range(300):
+        head_x, head_y = game.snake[0]
+        if chooser.random() < 0.3:
+            game.food = (head_x + game.direction.value[0], head_y + game.direction.value[1])
+        diff = json.loads(web.tick(chooser.choice(["", "", "w", "a", "s", "d", "+"])))
+        if not diff["alive"]:
+            break
+        apply(diff)
+        assert diff["length"] == len(game.snake) and diff["speed"] == game.game_speed_ms
+        # Only the old tail, the old and new head and the old and new food can change
+        assert len(diff["cells"]) <= 5
+
+
+def test_tick_keeps_later_turns_for_later_ticks():
+    """Test that quick turns play out over the next ticks, and q quits"""
+    web = WebGame(seed=1)
+    web.game.food = (1, 1)
+    web.start()
+    head_x, head_y = web.game.snake[0]
+    
+    diff = json.loads(web.tick("wa"))
+    assert diff["direction"] == "UP" and diff["head"] == [head_x, head_y - 1]
+    diff = json.loads(web.tick())
+    assert diff["direction"] == "LEFT" and diff["head"] == [head_x - 1, head_y - 1]
+    assert json.loads(web.tick("q")) == {"quit": True}
+
+
+def test_web_and_terminal_games_match():
+    """Test that the web build and the terminal game play identically from the same seed and keys"""
+    chooser = random.Random(9)
+    eaten = 0
+    for seed in range(5):
+        web = WebGame(width=16, height=12, seed=seed)
+        terminal = SnakeGame(width=16, height=12, debug=False, skip_menu=True, seed=seed)
+        web.start()
+        for _ in range(200):
+            keys = chooser.choice(["", "", "", "w", "a", "s", "d", "wa", "sd"])
+            # Mostly steer towards the food so the snakes grow
+            if chooser.random() < 0.9:
+                dx = terminal.food[0] - terminal.snake[0][0]
+                dy = terminal.food[1] - terminal.snake[0][1]
+                keys = ("d" if dx > 0 else "a") if dx else ("s" if dy > 0 else "w")
+            diff = json.loads(web.tick(keys))
+            for key in keys:
+                terminal.handle_input(key)
+            event = terminal.step()
+            assert diff["event"] == event.value and diff["state"] == terminal.state.value
+            assert list(web.game.snake) == list(terminal.snake)
+            assert web.game.food == terminal.food and web.game.score == terminal.score
+            eaten += event.value == "eat"
+            if not diff["alive"]:
+                break
+    assert eaten > 0
+
+
+def test_page_loads_every_module_it_needs():
+    """Test that the page fetches every snake_game module that snake_game.web imports"""
+    page = WEB_PAGE.read_text(encoding="utf-8")
+    files = re.findall(r"'(\w+\.py)'", re.search(r"const PACKAGE_FILES = \[(.*?)\];", page).group(1))
+    loaded = {module.split('.')[1] + '.py' for module in import_times('snake_game.web')
+              if module.startswith('snake_game.')}
+    assert loaded | {'__init__.py'} == set(files)
+    
+    # The page's own bootstrap code runs against the package as is
+    bootstrap = re.search(r"pyodide\.runPython\(`(.*?)`\);", page, re.S).group(1)
+    namespace = {}
+    exec(bootstrap, namespace)
+    assert isinstance(namespace["game"], WebGame)